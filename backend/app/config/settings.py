@@ -51,11 +51,49 @@ class Settings(BaseSettings):
     # ── Telegram ─────────────────────────────────────────
     TELEGRAM_BOT_TOKEN: str = ""
     TELEGRAM_ADMIN_CHAT_ID: str = ""
+    TELEGRAM_API_BASE: str = "https://api.telegram.org"
+    TELEGRAM_WORKERS: int = 2                 # Outbox workers sending queued notifications
+    TELEGRAM_QUEUE_SIZE: int = 1000           # Queued notifications; the oldest is dropped beyond this
+    TELEGRAM_MAX_RETRIES: int = 4             # Retries per queued notification (backoff / retry_after)
+    TELEGRAM_TIMEOUT_S: float = 10.0
 
     # ── Risk Engine ──────────────────────────────────────
     RISK_CLUSTER_RADIUS_M: int = 200
     RISK_CLUSTER_MIN_REPORTS: int = 3
     RISK_LOOKBACK_DAYS: int = 7
+    RISK_INCREMENTAL_CLUSTERING: bool = True  # Keep cluster state between runs
+    RISK_WATERMARK_OVERLAP_S: int = 5         # Re-read window for late-committed reports
+    RISK_CLUSTER_ENGINE: str = "dbscan"       # dbscan | grid | postgis
+    RISK_CLUSTER_EXECUTOR: str = "process"    # process | thread – where DBSCAN runs
+    RISK_CLUSTER_WORKERS: int = 1             # > 1 clusters tiles in parallel
+    RISK_TILE_SIZE_M: int = 5000              # Tile side for partitioned runs; 0 = one problem
+    RISK_CLUSTER_INTERVAL_S: int = 300        # Scheduled run period; 0 = manual trigger only
+    RISK_DECAY_HALF_LIFE_H: float = 72.0      # Zone score halves per this many hours without evidence
+    RISK_DECAY_MIN_SCORE: int = 10            # Zones decayed below this are deactivated
+    RISK_TIMEZONE: str = "Asia/Kolkata"       # Local time for hourly zone profiles
+    RISK_HOURLY_PRIOR: float = 1.0            # Weighted reports per hour assumed before evidence
+
+    # ── Path Finder ──────────────────────────────────────
+    ZONE_INDEX_MAX_AGE_S: int = 600           # Rebuild the in-memory zone index at least this often
+    ROUTE_SIMPLIFY_FRACTION: float = 0.25     # Simplify tolerance for zone queries, × RISK_CLUSTER_RADIUS_M; 0 = off
+    ROUTE_CACHE_SIZE: int = 4096              # Cached route scores; 0 disables the cache
+    ROUTE_CACHE_TTL_S: int = 300              # Cached scores expire after this many seconds
+    ROAD_GRAPH_PATH: str = ""                 # .npz road graph for /route/safe (build_road_graph.py)
+    SAFE_ROUTE_RISK_WEIGHT: float = 4.0       # Extra cost per metre inside a score-100 zone, × length
+    SAFE_ROUTE_MAX_SNAP_M: int = 500          # Max distance from origin / destination to the graph
+    RISK_RASTER_BBOX: str = ""                # "min_lat,min_lng,max_lat,max_lng" city raster; "" = off
+    RISK_RASTER_CELL_M: int = 20              # Raster cell side
+
+    # ── Failsafe ─────────────────────────────────────────
+    GUARDIAN_LOCATION_MAX_AGE_S: int = 60     # Guardians without a heartbeat this recent are not dispatched
+    GUARDIAN_INDEX: bool = False              # Dispatch from the in-process guardian index; single-worker deployments only
+    GUARDIAN_INDEX_CELL_M: int = 2000         # Guardian index grid cell side
+    SOS_WS_SEND_TIMEOUT_S: float = 2.0        # Per-guardian WebSocket alert send timeout
+    SOS_DISPATCH_WAVES: str = "0:10000:3,20:2000,20:5000,30:10000"  # "delay_s:radius_m[:max_guardians],…"; delays count from the previous wave
+    SOS_ESCALATION_POLL_S: int = 5            # Check for due escalations (from any worker) at least this often
+    SOS_ESCALATION_BATCH: int = 100           # Due escalations claimed per transaction
+    SOS_ESCALATION_LEASE_S: int = 30          # A claimed stage is retried if it has not finished after this long
+    SOS_ESCALATION_CONCURRENCY: int = 4       # Escalations of one batch run at most this many at a time
 
     # ── Silent Witness ───────────────────────────────────
     CHECKIN_TIMEOUT_MINUTES: int = 30
@@ -7,6 +7,7 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from app.config.settings import get_settings
 from app.database import init_db
@@ -61,8 +62,34 @@ async def lifespan(app: FastAPI):
                 db.add(new_admin)
                 await db.commit()
 
+    # Periodic Oracle clustering
+    from app.services.oracle_scheduler import oracle_scheduler
+    oracle_scheduler.start()
+
+    # Warm the in-memory risk zone index for route scoring
+    from app.services.zone_index import zone_index
+    zone_index.schedule_refresh()
+
+    # Warm the in-memory guardian index for SOS dispatch
+    from app.services.guardian_index import guardian_index
+    guardian_index.schedule_warm()
+
+    # Resume and run durable SOS escalations
+    from app.services.sos_escalation import escalation_scheduler
+    escalation_scheduler.start()
+
+    # Load the road graph for /route/safe, if one is configured
+    from app.services.road_graph import get_road_graph
+    get_road_graph()
+
     yield
     logger.info("👋 SafePulse shutting down …")
+    await oracle_scheduler.stop()
+    await escalation_scheduler.stop()
+    from app.services.telegram_bot import telegram_outbox
+    await telegram_outbox.stop()
+    from app.services.risk_engine import shutdown_executor
+    shutdown_executor()
 
 
 app = FastAPI(
@@ -83,6 +110,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ── Compression (route profiles, map layers) ─────────
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # ── Routers ───────────────────────────────────────────
 app.include_router(auth.router)
 app.include_router(users.router)
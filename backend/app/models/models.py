@@ -16,11 +16,12 @@ from sqlalchemy import (
     Float,
     ForeignKey,
     Integer,
+    SmallInteger,
     String,
     Text,
     func,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import relationship
 
 from app.database.session import Base
@@ -157,6 +158,13 @@ class RiskZone(Base):
     risk_score = Column(Integer, nullable=False, default=0)
     risk_level = Column(String(20), nullable=True, default="MEDIUM")  # HIGH | MEDIUM
     active = Column(Boolean, default=True)
+    # Score and time of the last clustering evidence; the decay sweep
+    # recomputes risk_score from these. NULL for authority-created zones.
+    evidence_score = Column(Integer, nullable=True)
+    evidence_at = Column(DateTime(timezone=True), nullable=True)
+    # Risk multiplier per local hour of day (0-23), in percent of risk_score
+    # (100 = the zone's average hour). NULL = no time-of-day variation.
+    hourly_profile = Column(ARRAY(SmallInteger), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
@@ -218,6 +226,10 @@ class SOSEvent(Base):
     status = Column(Enum(SOSStatus), nullable=False, default=SOSStatus.ACTIVE)
     triggered_at = Column(DateTime(timezone=True), server_default=func.now())
     resolved_at = Column(DateTime(timezone=True), nullable=True)
+    # Durable escalation timer: the next SOS_DISPATCH_WAVES wave and when
+    # it is due. NULL once the SOS is handled or the waves are done.
+    escalation_stage = Column(SmallInteger, nullable=False, default=0, server_default="0")
+    escalate_at = Column(DateTime(timezone=True), nullable=True)
 
     user = relationship("User", foreign_keys=[user_id])
 
@@ -22,6 +22,7 @@ from app.models import (
     UserRole,
 )
 from app.schemas import SOSResolve, SOSResponse, SOSTrigger
+from app.services.guardian_index import guardian_index
 from app.services.sos import accept_sos_alert, decline_sos_alert, resolve_sos, trigger_sos
 from app.utils import logger, point_to_wkt
 
@@ -129,6 +130,7 @@ async def update_guardian_location(
         db.add(loc)
 
     await db.commit()
+    guardian_index.update_location(guardian, payload.lat, payload.lng)
     return {"message": "Location updated", "lat": payload.lat, "lng": payload.lng}
 
 
@@ -152,6 +154,7 @@ async def update_guardian_status(
         raise HTTPException(status_code=400, detail=f"Invalid status value: {e}")
 
     await db.commit()
+    guardian_index.update_status(guardian)
     return {
         "message": "Status updated",
         "availability_status": guardian.availability_status.value,
@@ -6,14 +6,18 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config.settings import get_settings
 from app.database import get_db
 from app.middleware.auth import _get_current_user
 from app.models import Report, RiskZone, User
 from app.schemas import ReportCreate, ReportResponse, RiskZoneResponse
-from app.services.risk_engine import run_clustering
+from app.services.oracle_scheduler import oracle_scheduler
+from app.services.risk_raster import get_risk_raster
 from app.services.websocket_manager import ws_manager
 from app.utils import logger, point_to_wkt
 
+settings = get_settings()
+
 router = APIRouter(tags=["Oracle"])
 
 
@@ -106,22 +110,50 @@ async def get_risk_zones(
     ]
 
 
+@router.get("/risk-zones/risk-at")
+async def get_point_risk(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Risk at a point: the highest score of the active zones around it.
+    Read from the city risk raster when the point is inside it;
+    otherwise zones within RISK_CLUSTER_RADIUS_M of the point.
+    """
+    raster = get_risk_raster()
+    risk_score = raster.point(lat, lng) if raster is not None else None
+    if risk_score is None:
+        stmt = select(func.coalesce(func.max(RiskZone.risk_score), 0)).where(
+            RiskZone.active == True,  # noqa: E712
+            func.ST_DWithin(
+                RiskZone.centroid,
+                func.ST_GeogFromText(f"POINT({lng} {lat})"),
+                settings.RISK_CLUSTER_RADIUS_M,
+            ),
+        )
+        risk_score = (await db.execute(stmt)).scalar_one()
+    return {"lat": lat, "lng": lng, "risk_score": int(risk_score)}
+
+
 # ── Trigger clustering (admin / cron) ────────────────
 @router.post("/risk-zones/cluster", status_code=status.HTTP_200_OK)
 async def trigger_clustering(
     user: User = Depends(_get_current_user),
-    db: AsyncSession = Depends(get_db),
 ):
     """
     Manually trigger the DBSCAN clustering pipeline.
-    In production, call this from a scheduled task / cron.
+    The same pipeline also runs every RISK_CLUSTER_INTERVAL_S seconds;
+    a trigger during a run joins that run instead of starting another.
+    Zone changes are broadcast on the risk-updates channel.
     """
-    count = await run_clustering(db)
-
-    # Broadcast risk update
-    await ws_manager.broadcast_risk({
-        "type": "zones_updated",
-        "zones_updated": count,
-    })
-
-    return {"message": f"Clustering complete. {count} zone(s) created/updated."}
+    result = await oracle_scheduler.trigger()
+
+    return {
+        "message": f"Clustering complete. {result.count} zone(s) created/updated.",
+        "zones_updated": result.count,
+        "zones_retired": len(result.retired),
+        "clusters": result.clusters,
+        "reports": result.reports,
+        "duration_ms": round(result.duration_s * 1000),
+    }
@@ -1,13 +1,26 @@
 """
-Path Finder – Route scoring routes.
+Path Finder – Route scoring and safe-route routes.
 """
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.schemas import RouteScoreRequest, RouteScoreResponse
-from app.services.route_scorer import score_route
+from app.middleware.auth import require_role
+from app.models import User, UserRole
+from app.schemas import (
+    RankedRouteScore,
+    RouteExposureRequest,
+    RouteExposureResponse,
+    RouteScoreBatchRequest,
+    RouteScoreRequest,
+    RouteScoreResponse,
+    SafeRouteRequest,
+    SafeRouteResponse,
+)
+from app.services.road_graph import get_road_graph
+from app.services.route_cache import route_cache
+from app.services.route_scorer import find_safe_route, route_exposure, score_route, score_routes
 
 router = APIRouter(prefix="/route", tags=["Path Finder"])
 
@@ -19,7 +32,62 @@ async def score_route_endpoint(
 ):
     """
     Score a route polyline against active risk zones.
-    Accepts an encoded Mapbox polyline; returns risk score
-    and flagged segments.
+    Accepts an encoded Mapbox polyline and optional departure time;
+    returns risk score and flagged segments.
     """
-    return await score_route(payload.polyline, db)
+    return await score_route(payload.polyline, db, payload.departure_time)
+
+
+@router.post("/score/batch", response_model=list[RankedRouteScore])
+async def score_routes_endpoint(
+    payload: RouteScoreBatchRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Score alternative route polylines in one call, against a single
+    zone load. Returns every route ranked safest first; ``index`` is
+    the route's position in the request.
+    """
+    return await score_routes(payload.polylines, db, payload.departure_time)
+
+
+@router.post("/exposure", response_model=RouteExposureResponse)
+async def route_exposure_endpoint(
+    payload: RouteExposureRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Risk along a route polyline: cumulative distance against local risk,
+    downsampled to ``samples`` points, plus metres spent in risk zones.
+    Arrays are plain integers so the response compresses well.
+    """
+    return await route_exposure(payload.polyline, payload.samples, db)
+
+
+@router.post("/safe", response_model=SafeRouteResponse)
+async def safe_route_endpoint(
+    payload: SafeRouteRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Suggest a route between two points that avoids active risk zones,
+    computed offline on the local road graph (ROAD_GRAPH_PATH).
+    """
+    graph = get_road_graph()
+    if graph is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Safe routing is not configured (no road graph)",
+        )
+    try:
+        return await find_safe_route(payload.origin, payload.destination, graph, db)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+
+@router.get("/cache/stats", tags=["Admin"])
+async def route_cache_stats(
+    user: User = Depends(require_role(UserRole.ADMIN)),
+):
+    """Admin: route score cache size and hit / miss / eviction counters."""
+    return route_cache.stats()
@@ -32,6 +32,7 @@ from app.models import (
     RiskReportPriority,
     RiskZone,
 )
+from app.services.zone_index import zone_index
 
 router = APIRouter(prefix="/api", tags=["Reports"])
 
@@ -277,6 +278,7 @@ async def accept_report(
         )
         db.add(risk_zone)
         await db.commit()
+        zone_index.invalidate()
         await db.refresh(report)
 
         return {
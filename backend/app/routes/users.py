@@ -12,6 +12,7 @@ from app.database import get_db
 from app.middleware.auth import _get_current_user, require_role
 from app.models import User, UserRole, UserStatus, DeletionRequest, GuardianCategory, PhoneOTP
 from app.schemas.schemas import UserCreate, UserResponse, AuthorityCreate, DeletionRequestCreate, DeletionRequestResponse, RoleUpgradeRequest, SendOTPRequest, VerifyOTPRequest
+from app.services.guardian_index import guardian_index
 from app.utils.security import get_password_hash, verify_password
 from app.utils.email import send_application_decision_email
 from app.utils import logger
@@ -337,6 +338,7 @@ async def delete_guardian(
         
     await db.delete(user)
     await db.commit()
+    guardian_index.remove(user.id)
     return {"message": "Guardian deleted successfully."}
 
 
@@ -355,6 +357,7 @@ async def approve_guardian(
         raise HTTPException(status_code=404, detail="User not found or you don't have access")
     user.status = UserStatus.POLICE_VERIFICATION_PENDING
     await db.commit()
+    guardian_index.update_status(user)
     return {"message": "Guardian approved. Sent email verification link (simulated) -> Police verification pending."}
 
 @router.post("/guardians/{user_id}/reject", status_code=status.HTTP_200_OK)
@@ -372,6 +375,7 @@ async def reject_guardian(
         raise HTTPException(status_code=404, detail="User not found or you don't have access")
     user.status = UserStatus.REJECTED
     await db.commit()
+    guardian_index.update_status(user)
     return {"message": "Guardian application rejected."}
 
 @router.post("/guardians/{user_id}/police-verify", status_code=status.HTTP_200_OK)
@@ -390,6 +394,7 @@ async def police_verify_guardian(
         raise HTTPException(status_code=400, detail="User not found or not in correct state")
     user.status = UserStatus.ACTIVE if approved else UserStatus.REJECTED
     await db.commit()
+    guardian_index.update_status(user)
     return {"message": "Guardian is now Active" if approved else "Guardian Police Verification Rejected"}
 
 @router.post("/deletion-request", response_model=DeletionRequestResponse, status_code=status.HTTP_201_CREATED)
@@ -446,6 +451,8 @@ async def resolve_deletion_request(
             await db.delete(target)
             
     await db.commit()
+    if approve and target:
+        guardian_index.remove(target.id)
     return {"message": f"Deletion request {req.status}"}
 
 @router.post("/authority", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
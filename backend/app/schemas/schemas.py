@@ -199,6 +199,9 @@ class RiskZoneQueryParams(BaseModel):
 # ── Route Scoring ────────────────────────────────────
 class RouteScoreRequest(BaseModel):
     polyline: str = Field(..., description="Encoded polyline from Mapbox")
+    departure_time: Optional[datetime] = Field(
+        None, description="Score zones for this hour of day (naive = city local time)"
+    )
 
 
 class HighRiskSegment(BaseModel):
@@ -213,6 +216,45 @@ class RouteScoreResponse(BaseModel):
     recommendation: RouteRecommendation
 
 
+class RouteScoreBatchRequest(BaseModel):
+    polylines: List[str] = Field(
+        ..., min_length=1, max_length=10, description="Encoded polylines of alternative routes"
+    )
+    departure_time: Optional[datetime] = Field(
+        None, description="Score zones for this hour of day (naive = city local time)"
+    )
+
+
+class RankedRouteScore(RouteScoreResponse):
+    index: int = Field(..., description="Position of the route in the request")
+    rank: int = Field(..., description="1 = safest")
+
+
+class RouteExposureRequest(BaseModel):
+    polyline: str = Field(..., description="Encoded polyline from Mapbox")
+    samples: int = Field(200, ge=1, le=2000, description="Profile length after downsampling")
+
+
+class RouteExposureResponse(BaseModel):
+    total_distance_m: float
+    exposed_distance_m: float = Field(..., description="Metres of route inside risk zones")
+    max_risk: int
+    # Parallel arrays: bin k ends distance_m[k] metres along the route and
+    # holds the highest risk seen in it
+    distance_m: List[int]
+    risk: List[int]
+
+
+class SafeRouteRequest(BaseModel):
+    origin: PointSchema
+    destination: PointSchema
+
+
+class SafeRouteResponse(RouteScoreResponse):
+    polyline: str = Field(..., description="Encoded polyline of the suggested route")
+    distance_m: float
+
+
 # ── Guardian ─────────────────────────────────────────
 class GuardianRequest(BaseModel):
     lat: float = Field(..., ge=-90, le=90)
@@ -1,5 +1,5 @@
 from app.services.risk_engine import run_clustering
-from app.services.route_scorer import score_route
+from app.services.route_scorer import find_safe_route, score_route, score_routes
 from app.services.guardian import (
     request_guardian,
     accept_session,
@@ -16,6 +16,8 @@ from app.services.ncrb_baseline import get_city_baseline_score, get_city_baselin
 __all__ = [
     "run_clustering",
     "score_route",
+    "score_routes",
+    "find_safe_route",
     "request_guardian",
     "accept_session",
     "complete_session",
@@ -0,0 +1,137 @@
+"""
+Oracle – Tile partitioning.
+
+Splits a clustering problem into fixed square tiles of RISK_TILE_SIZE_M
+so tiles can be clustered independently (and in parallel) and a change
+in one neighbourhood – or one city – never touches the others.
+
+Each tile is clustered by the configured engine together with a halo of
+every point within two cluster radii of it. With that halo:
+
+  - own points and halo points within one radius see all of their
+    neighbours, so their core flags are exact; core flags further out
+    can only be missed, never invented.
+  - every core–core edge with one end in the tile lies entirely inside
+    the tile's run, and own border points find all their core neighbours.
+
+Stitching then merges tiles: a core point that appears in several tiles
+links their clusters, and connected components of that graph give the
+global labels – exactly the DBSCAN partition (border points reachable
+from two clusters may land in either, as usual).
+
+Everything here takes and returns plain NumPy arrays so tiles can be
+clustered in the clustering executor.
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from app.utils.geo import project_local_m
+
+_NEIGHBOUR_OFFSETS = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+
+
+def partition_tiles(
+    lat: np.ndarray,
+    lng: np.ndarray,
+    tile_m: float,
+    radius_m: float,
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Return (members, own) for every tile that owns points: ``members``
+    indexes the tile's points plus its two-radius halo, ``own`` marks the
+    tile's own points. ``tile_m`` must be at least 2 × ``radius_m``.
+    """
+    # Project at the latitude furthest from the equator: projected
+    # distances never exceed true ones, so the halo is a superset.
+    lat0 = float(lat[np.argmax(np.abs(lat))])
+    x, y = project_local_m(lat, lng, lat0)
+    x = x - x.min()
+    y = y - y.min()
+
+    # Pad by one tile so neighbour keys stay non-negative and unique
+    tile_x = np.floor(x / tile_m).astype(np.int64) + 1
+    tile_y = np.floor(y / tile_m).astype(np.int64) + 1
+    ncols = int(tile_x.max()) + 2
+
+    def gap(offset: np.ndarray, step: int) -> np.ndarray:
+        """Distance from each point to the neighbouring tile ``step`` away (one axis)."""
+        if step == 0:
+            return np.zeros(len(offset))
+        return offset if step < 0 else tile_m - offset
+
+    off_x = x - (tile_x - 1) * tile_m
+    off_y = y - (tile_y - 1) * tile_m
+    keys, points, own = [], [], []
+    for dy, dx in _NEIGHBOUR_OFFSETS:
+        idx = np.flatnonzero(np.maximum(gap(off_x, dx), gap(off_y, dy)) < 2 * radius_m)
+        keys.append((tile_y[idx] + dy) * ncols + tile_x[idx] + dx)
+        points.append(idx)
+        own.append(np.full(len(idx), dx == 0 and dy == 0))
+    keys = np.concatenate(keys)
+    points = np.concatenate(points)
+    own = np.concatenate(own)
+
+    order = np.argsort(keys, kind="stable")
+    keys, points, own = keys[order], points[order], own[order]
+    starts = np.flatnonzero(np.diff(keys, prepend=-1))
+    tiles = []
+    for start, end in zip(starts.tolist(), np.append(starts[1:], len(keys)).tolist()):
+        if own[start:end].any():
+            tiles.append((points[start:end], own[start:end]))
+    return tiles
+
+
+def stitch_tile_labels(
+    n: int,
+    tiles: List[Tuple[np.ndarray, np.ndarray]],
+    tile_results: List[Tuple[np.ndarray, np.ndarray]],
+) -> np.ndarray:
+    """
+    Merge per-tile (labels, core) engine results into global labels
+    (-1 = noise) for n points. Clusters that share a core point are one.
+    """
+    # Graph nodes: one per (tile, local cluster), then one per point
+    offsets = np.cumsum([0] + [int(labels.max()) + 1 for labels, _ in tile_results])
+    n_nodes = int(offsets[-1])
+    edge_cluster, edge_point = [], []
+    point_node = np.full(n, -1, dtype=np.int64)
+    for (members, own), (labels, core), offset in zip(tiles, tile_results, offsets[:-1].tolist()):
+        labelled = labels >= 0
+        linked = labelled & core
+        edge_cluster.append(labels[linked] + offset)
+        edge_point.append(members[linked] + n_nodes)
+        home = labelled & own
+        point_node[members[home]] = labels[home] + offset
+
+    rows = np.concatenate(edge_cluster)
+    cols = np.concatenate(edge_point)
+    graph = coo_matrix(
+        (np.ones(len(rows), dtype=np.int8), (rows, cols)),
+        shape=(n_nodes + n, n_nodes + n),
+    )
+    _, component = connected_components(graph, directed=False)
+
+    labels = np.full(n, -1, dtype=np.int64)
+    clustered = point_node >= 0
+    _, labels[clustered] = np.unique(component[point_node[clustered]], return_inverse=True)
+    return labels
+
+
+def batch_tiles(
+    tiles: List[Tuple[np.ndarray, np.ndarray]],
+    n_batches: int,
+) -> List[List[int]]:
+    """Group tile indices into up to n_batches batches of similar point counts."""
+    sizes = np.array([len(members) for members, _ in tiles])
+    batches: List[List[int]] = [[] for _ in range(min(n_batches, len(tiles)))]
+    load = np.zeros(len(batches))
+    # Largest tiles first, each onto the lightest batch so far
+    for t in np.argsort(-sizes, kind="stable").tolist():
+        b = int(np.argmin(load))
+        batches[b].append(t)
+        load[b] += sizes[t]
+    return batches
@@ -0,0 +1,246 @@
+"""
+Oracle – Grid clustering engine.
+
+Grid DBSCAN for a single city, selected with
+RISK_CLUSTER_ENGINE = "grid".
+
+Points are projected to local metres and bucketed into square cells of
+side RISK_CLUSTER_RADIUS_M. Every eps-neighbour of a point then lies in
+its own cell or one of the 8 surrounding cells, so neighbour search
+only compares points from those 9 cells instead of building a
+haversine tree over the whole window. Points are processed in cell
+order, so those comparisons read neighbouring memory.
+
+Cost grows with the number of points plus the number of neighbour
+pairs – close to linear for a window of constant density, but a dense
+hotspot adds pairs quadratically in its own size. It is not strictly
+linear: see the cache_pairs note below.
+
+Semantics match sklearn DBSCAN (min_samples counts the point itself):
+  - core points:   ≥ min_samples neighbours within eps
+  - clusters:      connected components of core points
+  - border points: attached to the cluster of one core neighbour
+  - noise:         label -1
+Cluster numbering differs from sklearn; the partition does not (up to the
+usual DBSCAN ambiguity for border points reachable from two clusters).
+
+Candidate pairs are generated in chunks of at most ``max_pairs``; beyond
+``cache_pairs`` they are regenerated for the second pass rather than
+stored, so a dense hotspot cannot blow up memory – at the price of
+generating them twice, which shows up as a step in run time once a
+window crosses cache_pairs neighbour pairs.
+"""
+
+from typing import Iterator, Tuple
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from app.utils.geo import EARTH_RADIUS_M, project_local_m
+
+# Own cell plus the 4 cells after it in scan order; together with the
+# mirrored lookups from those cells this covers the full 3 × 3 block.
+_FORWARD_OFFSETS = [(0, 0), (0, 1), (1, -1), (1, 0), (1, 1)]
+
+
+def grid_dbscan_labels(
+    lat: np.ndarray,
+    lng: np.ndarray,
+    radius_m: float,
+    min_samples: int,
+    max_pairs: int = 4_000_000,
+    cache_pairs: int = 16_000_000,
+) -> np.ndarray:
+    """Return DBSCAN labels (-1 = noise) for lat/lng arrays in degrees."""
+    return grid_dbscan(lat, lng, radius_m, min_samples, max_pairs, cache_pairs)[0]
+
+
+def grid_dbscan(
+    lat: np.ndarray,
+    lng: np.ndarray,
+    radius_m: float,
+    min_samples: int,
+    max_pairs: int = 4_000_000,
+    cache_pairs: int = 16_000_000,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (labels, core_mask) for lat/lng arrays in degrees."""
+    n = len(lat)
+    if n < min_samples:
+        return np.full(n, -1, dtype=np.int64), np.zeros(n, dtype=bool)
+
+    # Work in cell order, so neighbours are close in memory
+    order = np.argsort(_cell_keys(lat, lng, radius_m)[0], kind="stable")
+    labels, core = _grid_dbscan_sorted(lat[order], lng[order], radius_m, min_samples, max_pairs, cache_pairs)
+    out_labels = np.empty(n, dtype=np.int64)
+    out_core = np.empty(n, dtype=bool)
+    out_labels[order] = labels
+    out_core[order] = core
+    return out_labels, out_core
+
+
+def _grid_dbscan_sorted(
+    lat: np.ndarray,
+    lng: np.ndarray,
+    radius_m: float,
+    min_samples: int,
+    max_pairs: int,
+    cache_pairs: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    n = len(lat)
+
+    def pair_chunks():
+        return _neighbour_pairs(lat, lng, radius_m, max_pairs)
+
+    # Pass 1: neighbour counts → core points (every point neighbours itself).
+    # Up to ``cache_pairs`` pairs are kept for pass 2 instead of regenerated.
+    counts = np.ones(n, dtype=np.int64)
+    cached: list = []
+    kept = 0
+    for i, j in pair_chunks():
+        counts += np.bincount(i, minlength=n)
+        counts += np.bincount(j, minlength=n)
+        kept += len(i)
+        cached = cached + [(i, j)] if kept <= cache_pairs else []
+    core = counts >= min_samples
+    if not core.any():
+        return np.full(n, -1, dtype=np.int64), core
+
+    # Pass 2: connected components over core–core edges, border targets
+    comp = np.arange(n, dtype=np.int64)
+    border_of = np.full(n, -1, dtype=np.int64)
+    edge_i: list = []
+    edge_j: list = []
+    buffered = 0
+    for i, j in cached if kept <= cache_pairs else pair_chunks():
+        core_i, core_j = core[i], core[j]
+        both = core_i & core_j
+        edge_i.append(i[both])
+        edge_j.append(j[both])
+        buffered += len(edge_i[-1])
+
+        border_of[i[~core_i & core_j]] = j[~core_i & core_j]
+        border_of[j[core_i & ~core_j]] = i[core_i & ~core_j]
+
+        if buffered >= cache_pairs:
+            comp = _merge_components(comp, edge_i, edge_j)
+            edge_i, edge_j, buffered = [], [], 0
+    comp = _merge_components(comp, edge_i, edge_j)
+
+    labels = np.full(n, -1, dtype=np.int64)
+    _, labels[core] = np.unique(comp[core], return_inverse=True)
+    border = ~core & (border_of >= 0)
+    labels[border] = labels[border_of[border]]
+    return labels, core
+
+
+def _merge_components(
+    comp: np.ndarray,
+    edge_i: list,
+    edge_j: list,
+) -> np.ndarray:
+    """
+    Fold a batch of edges into the running component assignment.
+    ``comp`` maps every point to its component's representative point.
+
+    Costs O(n + edges). It runs once per cache_pairs core–core edges
+    (usually just once), so the n term is small next to the edges.
+    """
+    if not edge_i:
+        return comp
+    ei = np.concatenate(edge_i)
+    if len(ei) == 0:
+        return comp
+    ej = np.concatenate(edge_j)
+    n = len(comp)
+    rows = np.concatenate([ei, np.arange(n, dtype=ei.dtype)])
+    cols = np.concatenate([ej, comp.astype(ej.dtype)])
+    graph = coo_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(n, n))
+    _, merged = connected_components(graph, directed=False)
+    # Component ids → lowest point index in each component
+    _, representative = np.unique(merged, return_index=True)
+    return representative[merged].astype(np.int64)
+
+
+def _cell_keys(lat: np.ndarray, lng: np.ndarray, radius_m: float) -> Tuple[np.ndarray, int]:
+    """
+    Key of every point's radius_m grid cell (row-major) and the row
+    length; rows and columns are padded by one cell on each side.
+    """
+    # Project at the latitude furthest from the equator: projected
+    # distances never exceed true ones, so the 3 × 3 block is a superset.
+    lat0 = float(lat[np.argmax(np.abs(lat))])
+    x, y = project_local_m(lat, lng, lat0)
+
+    cell_x = np.floor(x / radius_m).astype(np.int64)
+    cell_y = np.floor(y / radius_m).astype(np.int64)
+    # Pad by one cell so every neighbour key stays non-negative and unique
+    cell_x -= cell_x.min() - 1
+    cell_y -= cell_y.min() - 1
+    ncols = int(cell_x.max()) + 2
+    return cell_y * ncols + cell_x, ncols
+
+
+def _neighbour_pairs(
+    lat: np.ndarray,
+    lng: np.ndarray,
+    radius_m: float,
+    max_pairs: int,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Yield (i, j) index arrays covering every unordered pair of distinct
+    points within radius_m exactly once, in chunks of roughly
+    ``max_pairs`` candidates.
+
+    Each point only looks "forward": at later points of its own cell and
+    at the 4 cells after it in scan order, which halves the work of a
+    full 3 × 3 block.
+    """
+    n = len(lat)
+    index_dtype = np.int32 if n < 2**31 else np.int64
+    keys, ncols = _cell_keys(lat, lng, radius_m)
+
+    order = np.argsort(keys, kind="stable").astype(index_dtype)
+    cells, cell_start, cell_count = np.unique(keys[order], return_index=True, return_counts=True)
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = np.arange(n)
+
+    offsets = np.array([dy * ncols + dx for dy, dx in _FORWARD_OFFSETS], dtype=np.int64)
+    nbr_keys = keys[:, None] + offsets[None, :]
+    pos = np.minimum(np.searchsorted(cells, nbr_keys), len(cells) - 1)
+    hit = cells[pos] == nbr_keys
+    start = np.where(hit, cell_start[pos], 0)
+    count = np.where(hit, cell_count[pos], 0)
+    # Own cell: only points after this one in sorted order
+    own_end = start[:, 0] + count[:, 0]
+    start[:, 0] = rank + 1
+    count[:, 0] = own_end - start[:, 0]
+    start = start.astype(index_dtype)
+    count = count.astype(index_dtype)
+    del nbr_keys, pos, hit, keys, rank
+
+    # Exact filter: equirectangular distance at the pair's mean latitude,
+    # which agrees with haversine to well under a millimetre at 200 m.
+    lat_r = np.radians(lat)
+    lng_r = np.radians(lng)
+    cos_lat = np.cos(lat_r)
+    max_rad2 = (float(radius_m) / EARTH_RADIUS_M) ** 2
+
+    # Split points into chunks whose candidate count stays under max_pairs
+    per_point = count.sum(axis=1, dtype=np.int64)
+    bounds = np.searchsorted(np.cumsum(per_point), np.arange(max_pairs, per_point.sum(), max_pairs))
+    chunk_bounds = np.unique(np.concatenate([[0], bounds, [n]]))
+
+    for a, b in zip(chunk_bounds[:-1].tolist(), chunk_bounds[1:].tolist()):
+        if a == b:
+            continue
+        c = count[a:b].ravel()
+        s = start[a:b].ravel()
+        total = int(c.sum())
+        i = np.repeat(np.repeat(np.arange(a, b, dtype=index_dtype), len(_FORWARD_OFFSETS)), c)
+        run_start = np.repeat(np.cumsum(c, dtype=np.int64) - c, c)
+        j = order[np.repeat(s, c) + np.arange(total, dtype=np.int64) - run_start]
+        dlat = lat_r[i] - lat_r[j]
+        dlng = (lng_r[i] - lng_r[j]) * (0.5 * (cos_lat[i] + cos_lat[j]))
+        close = dlat * dlat + dlng * dlng <= max_rad2
+        yield i[close], j[close]
@@ -0,0 +1,243 @@
+"""
+Failsafe – In-memory index of live guardians for SOS dispatch.
+
+Answers "which eligible guardians are within R metres" without a
+database round trip. Guardians are bucketed into a uniform lat/lng grid
+of GUARDIAN_INDEX_CELL_M cells, keyed by guardian id:
+
+  - /sos/guardian/location upserts a guardian's position and heartbeat
+    time; /sos/guardian/status and the admin guardian routes update the
+    duty / online / account flags.
+  - Entries whose last heartbeat is older than GUARDIAN_LOCATION_MAX_AGE_S
+    are skipped by lookups and evicted – lazily from the cells a lookup
+    touches, and by a full sweep at most once per max age.
+  - The index is cold until it has been warmed from guardian_locations
+    (scheduled at startup). While it is cold, or with GUARDIAN_INDEX
+    disabled, SOS dispatch falls back to its PostGIS query.
+
+The index is process-local: heartbeats reach only the worker that served
+them. It is therefore off by default; set GUARDIAN_INDEX=true only when
+the app runs a single worker.
+"""
+
+import asyncio
+import heapq
+import math
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Collection, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import get_settings
+from app.database.session import _get_session_factory
+from app.models import (
+    GuardianAvailabilityStatus,
+    GuardianLocation,
+    GuardianOnlineStatus,
+    User,
+    UserRole,
+    UserStatus,
+)
+from app.utils import EARTH_RADIUS_M, haversine_m, logger
+
+settings = get_settings()
+
+_M_PER_DEG_LAT = math.pi * EARTH_RADIUS_M / 180
+
+Cell = Tuple[int, int]
+
+
+@dataclass
+class GuardianEntry:
+    """Live state of one guardian."""
+
+    lat: float
+    lng: float
+    seen_at: float      # wall-clock time of the last location heartbeat
+    active: bool        # role GUARDIAN with an ACTIVE account
+    on_duty: bool
+    online: bool
+    cell: Cell
+
+    @property
+    def eligible(self) -> bool:
+        return self.active and self.on_duty and self.online
+
+
+class GuardianIndex:
+    """Process-local uniform-grid index of guardian positions."""
+
+    def __init__(self, cell_m: float, max_age_s: float):
+        self.d_deg = cell_m / _M_PER_DEG_LAT
+        self.max_age_s = max_age_s
+        self._entries: Dict[uuid.UUID, GuardianEntry] = {}
+        self._cells: Dict[Cell, Set[uuid.UUID]] = {}
+        self._last_sweep = time.time()
+        self._warm = False
+        self._warm_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def ready(self) -> bool:
+        """True once warmed from the database (and the index is enabled)."""
+        return settings.GUARDIAN_INDEX and self._warm
+
+    def _cell(self, lat: float, lng: float) -> Cell:
+        return math.floor(lat / self.d_deg), math.floor(lng / self.d_deg)
+
+    # ── Updates ───────────────────────────────────────
+    def update_location(
+        self,
+        guardian: User,
+        lat: float,
+        lng: float,
+        seen_at: Optional[float] = None,
+    ) -> None:
+        """Record a location heartbeat (``seen_at`` defaults to now)."""
+        now = time.time()
+        seen_at = now if seen_at is None else seen_at
+        entry = self._entries.get(guardian.id)
+        if entry is not None and entry.seen_at > seen_at:
+            return  # a newer heartbeat is already indexed
+
+        cell = self._cell(lat, lng)
+        if entry is not None and entry.cell != cell:
+            self._drop_from_cell(guardian.id, entry.cell)
+        self._entries[guardian.id] = GuardianEntry(
+            lat=lat,
+            lng=lng,
+            seen_at=seen_at,
+            active=_is_active(guardian),
+            on_duty=guardian.availability_status == GuardianAvailabilityStatus.ON_DUTY,
+            online=guardian.online_status == GuardianOnlineStatus.ONLINE,
+            cell=cell,
+        )
+        self._cells.setdefault(cell, set()).add(guardian.id)
+
+        if now - self._last_sweep >= self.max_age_s:
+            self.evict_stale(now)
+
+    def update_status(self, guardian: User) -> None:
+        """Refresh a guardian's account, duty and online flags."""
+        entry = self._entries.get(guardian.id)
+        if entry is None:
+            return  # picked up with the next location heartbeat
+        entry.active = _is_active(guardian)
+        entry.on_duty = guardian.availability_status == GuardianAvailabilityStatus.ON_DUTY
+        entry.online = guardian.online_status == GuardianOnlineStatus.ONLINE
+
+    def remove(self, guardian_id: uuid.UUID) -> None:
+        entry = self._entries.pop(guardian_id, None)
+        if entry is not None:
+            self._drop_from_cell(guardian_id, entry.cell)
+
+    def _drop_from_cell(self, guardian_id: uuid.UUID, cell: Cell) -> None:
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(guardian_id)
+            if not members:
+                del self._cells[cell]
+
+    def evict_stale(self, now: Optional[float] = None) -> int:
+        """Drop every entry without a heartbeat in the last max age; returns the count."""
+        now = time.time() if now is None else now
+        cutoff = now - self.max_age_s
+        stale = [gid for gid, entry in self._entries.items() if entry.seen_at < cutoff]
+        for gid in stale:
+            self.remove(gid)
+        self._last_sweep = now
+        return len(stale)
+
+    # ── Lookups ───────────────────────────────────────
+    def nearby(
+        self,
+        lat: float,
+        lng: float,
+        radius_m: float,
+        limit: Optional[int] = None,
+        exclude: Collection[uuid.UUID] = (),
+    ) -> List[Tuple[uuid.UUID, float]]:
+        """
+        (guardian_id, distance_m) of eligible, fresh guardians within
+        radius_m, nearest first: the ``limit`` nearest, skipping ``exclude``.
+        """
+        cutoff = time.time() - self.max_age_s
+        pad_lat = radius_m / _M_PER_DEG_LAT
+        pad_lng = pad_lat / max(math.cos(math.radians(min(abs(lat) + pad_lat, 89.9))), 1e-6)
+        r0, c0 = self._cell(lat - pad_lat, lng - pad_lng)
+        r1, c1 = self._cell(lat + pad_lat, lng + pad_lng)
+
+        ids: List[uuid.UUID] = []
+        stale: List[uuid.UUID] = []
+        for row in range(r0, r1 + 1):
+            for col in range(c0, c1 + 1):
+                for gid in self._cells.get((row, col), ()):
+                    entry = self._entries[gid]
+                    if entry.seen_at < cutoff:
+                        stale.append(gid)
+                    elif entry.eligible and gid not in exclude:
+                        ids.append(gid)
+        for gid in stale:
+            self.remove(gid)
+        if not ids:
+            return []
+
+        entries = [self._entries[gid] for gid in ids]
+        distances = haversine_m(
+            [e.lat for e in entries], [e.lng for e in entries], lat, lng
+        ).tolist()
+        found = [(gid, d) for gid, d in zip(ids, distances) if d <= radius_m]
+        if limit is not None:
+            return heapq.nsmallest(limit, found, key=lambda item: item[1])
+        found.sort(key=lambda item: item[1])
+        return found
+
+    # ── Warm-up ───────────────────────────────────────
+    def schedule_warm(self) -> None:
+        """Warm from the database in the background unless already running."""
+        if not settings.GUARDIAN_INDEX or self._warm:
+            return
+        if self._warm_task is None or self._warm_task.done():
+            self._warm_task = asyncio.create_task(self._warm_up(), name="guardian-index-warm")
+
+    async def _warm_up(self) -> None:
+        try:
+            async with _get_session_factory()() as db:
+                await self.warm(db)
+        except Exception as exc:
+            logger.error(f"Failsafe: Guardian index warm-up failed: {exc}")
+
+    async def warm(self, db: AsyncSession) -> None:
+        """Load every guardian with a fresh location, then mark the index ready."""
+        now = datetime.now(timezone.utc)
+        location = func.ST_GeomFromWKB(GuardianLocation.location)
+        stmt = (
+            select(
+                User,
+                func.ST_Y(location).label("lat"),
+                func.ST_X(location).label("lng"),
+                GuardianLocation.updated_at,
+            )
+            .join(GuardianLocation, GuardianLocation.guardian_id == User.id)
+            .where(User.role == UserRole.GUARDIAN)
+            .where(GuardianLocation.updated_at >= now - timedelta(seconds=self.max_age_s))
+        )
+        rows = (await db.execute(stmt)).all()
+        for user, lat, lng, updated_at in rows:
+            self.update_location(user, lat, lng, seen_at=updated_at.timestamp())
+        self._warm = True
+        logger.info(f"Failsafe: Guardian index warmed ({len(rows)} live guardian(s))")
+
+
+def _is_active(guardian: User) -> bool:
+    return guardian.role == UserRole.GUARDIAN and guardian.status == UserStatus.ACTIVE
+
+
+# Singleton
+guardian_index = GuardianIndex(settings.GUARDIAN_INDEX_CELL_M, settings.GUARDIAN_LOCATION_MAX_AGE_S)
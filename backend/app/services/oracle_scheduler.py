@@ -0,0 +1,101 @@
+"""
+Oracle – Clustering scheduler.
+
+Runs the risk-zone clustering pipeline every RISK_CLUSTER_INTERVAL_S
+seconds on its own database session, started and stopped from the app
+lifespan. Manual triggers (POST /risk-zones/cluster) go through the same
+scheduler.
+
+Single-flight: at most one run is in progress at a time. A trigger that
+arrives while a run is going joins it and gets that run's result
+instead of starting a second one. That only holds within a process;
+across workers, run_clustering takes a transaction-level advisory lock
+so runs on different workers queue behind each other instead of
+clustering and upserting the same zones concurrently.
+
+Each run is followed by the risk-zone decay sweep, and the zones the run
+created, updated or retired are broadcast on the risk-updates channel.
+"""
+
+import asyncio
+from typing import Optional
+
+from app.config.settings import get_settings
+from app.database.session import _get_session_factory
+from app.services.risk_engine import ClusteringResult, decay_risk_zones, run_clustering
+from app.services.websocket_manager import ws_manager
+from app.services.zone_index import zone_index
+from app.utils import logger
+
+settings = get_settings()
+
+
+class OracleScheduler:
+    """Periodic, single-flight runner for run_clustering."""
+
+    def __init__(self):
+        self._loop_task: Optional[asyncio.Task] = None
+        self._current: Optional[asyncio.Task] = None
+        self.last_result: Optional[ClusteringResult] = None
+
+    # ── Lifecycle ─────────────────────────────────────
+    def start(self) -> None:
+        """Start the periodic loop (no-op if the interval is 0)."""
+        if settings.RISK_CLUSTER_INTERVAL_S <= 0 or self._loop_task is not None:
+            return
+        self._loop_task = asyncio.create_task(self._loop(), name="oracle-scheduler")
+        logger.info(f"Oracle: Scheduled clustering every {settings.RISK_CLUSTER_INTERVAL_S}s")
+
+    async def stop(self) -> None:
+        """Cancel the loop and any run in progress."""
+        for task in (self._loop_task, self._current):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._loop_task = None
+        self._current = None
+
+    # ── Runs ──────────────────────────────────────────
+    async def trigger(self) -> ClusteringResult:
+        """Run clustering now, or join the run already in progress."""
+        if self._current is None or self._current.done():
+            self._current = asyncio.create_task(self._run(), name="oracle-run")
+        # shield: a cancelled caller must not cancel the shared run
+        return await asyncio.shield(self._current)
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.RISK_CLUSTER_INTERVAL_S)
+            try:
+                await self.trigger()
+            except Exception as exc:
+                logger.error(f"Oracle: Scheduled clustering failed: {exc}")
+
+    async def _run(self) -> ClusteringResult:
+        async with _get_session_factory()() as db:
+            result = await run_clustering(db)
+            result.retired = await decay_risk_zones(db)
+        self.last_result = result
+        if result.zones or result.retired:
+            zone_index.invalidate()
+
+        logger.info(
+            f"Oracle: Run finished in {result.duration_s * 1000:.0f} ms – "
+            f"{result.clusters} cluster(s), {result.count} zone(s) changed, "
+            f"{len(result.retired)} retired, {result.reports} report(s) in window"
+        )
+        if result.zones or result.retired:
+            await ws_manager.broadcast_risk({
+                "type": "zones_updated",
+                "zones_updated": result.count,
+                "zones": [zone.to_dict() for zone in result.zones],
+                "zones_retired": [str(zone_id) for zone_id in result.retired],
+            })
+        return result
+
+
+# Singleton
+oracle_scheduler = OracleScheduler()
@@ -4,6 +4,14 @@ Oracle – Risk Awareness Engine.
 Clusters recent reports using DBSCAN, then creates or updates risk_zones
 with computed risk scores.
 
+The clustering engine is pluggable via RISK_CLUSTER_ENGINE:
+  - "dbscan": sklearn DBSCAN with the haversine metric (default)
+  - "grid":   grid DBSCAN on locally projected metres
+              (see app/services/grid_dbscan.py)
+  - "postgis": ST_ClusterDBSCAN plus centroid / score aggregation run
+              inside the database; only one row per cluster is returned.
+              Always a full run – incremental state is not used.
+
 ─────────────────────────────────────────────────────────────────────
 NCRB INTEGRATION (v2):
   The final risk score now blends real-time crowd-sourced data with
@@ -20,20 +28,47 @@ NCRB INTEGRATION (v2):
   - No API response structure changes.
   - No frontend modifications required.
 ─────────────────────────────────────────────────────────────────────
+INCREMENTAL CLUSTERING (v3):
+  With RISK_INCREMENTAL_CLUSTERING enabled the engine keeps the report
+  window, cluster labels and zone ids in process memory between runs.
+  Each run only:
+    - fetches reports created since the last watermark,
+    - expires reports that fell out of RISK_LOOKBACK_DAYS,
+    - re-runs DBSCAN on the neighbourhood of those changes,
+    - rescores / upserts the clusters whose membership changed.
+
+  Clusters more than 2 × RISK_CLUSTER_RADIUS_M away from any change
+  cannot gain or lose members, so their labels are reused as-is.
+  The first run after start-up (or after a failed run) is a full run.
+
+  The points to recluster are split into RISK_TILE_SIZE_M tiles with a
+  two-radius halo, clustered tile by tile across the executor's workers
+  and stitched back together (see app/services/cluster_tiles.py), so
+  only tiles around new reports are recomputed.
+─────────────────────────────────────────────────────────────────────
 """
 
+import asyncio
+import time
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import List, Tuple
+from typing import Dict, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
 
 import numpy as np
+from scipy.spatial import cKDTree
 from sklearn.cluster import DBSCAN
-from sqlalchemy import func, select
+from sqlalchemy import BigInteger, String, case, cast, func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.settings import get_settings
-from app.models import Report, ReportCategory, RiskZone
+from app.models import Report, ReportCategory
+from app.services.cluster_tiles import batch_tiles, partition_tiles, stitch_tile_labels
+from app.services.grid_dbscan import grid_dbscan
 from app.services.ncrb_baseline import get_city_baseline_score
-from app.utils import logger, point_to_wkt
+from app.utils import EARTH_RADIUS_M, logger
 
 settings = get_settings()
 
@@ -45,96 +80,538 @@ CATEGORY_WEIGHTS = {
     ReportCategory.OTHER: 1,
 }
 
+# Stable int8 codes for ReportCategory, used by the array-based pipeline
+CATEGORY_CODES = tuple(ReportCategory)
+
+
+@dataclass
+class _ReportColumns:
+    """
+    A slice of the report window as parallel typed arrays – the only form
+    reports take inside the engine, so nothing is kept per row.
+    """
+
+    ids: np.ndarray       # raw 16-byte UUIDs ("V16")
+    lat: np.ndarray       # float64 degrees
+    lng: np.ndarray       # float64 degrees
+    category: np.ndarray  # int8 index into CATEGORY_CODES
+    created: np.ndarray   # int64 epoch seconds
+
+    @classmethod
+    def allocate(cls, n: int) -> "_ReportColumns":
+        return cls(
+            ids=np.empty(n, dtype="V16"),
+            lat=np.empty(n, dtype=np.float64),
+            lng=np.empty(n, dtype=np.float64),
+            category=np.empty(n, dtype=np.int8),
+            created=np.empty(n, dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    def take(self, index) -> "_ReportColumns":
+        return _ReportColumns(
+            self.ids[index], self.lat[index], self.lng[index], self.category[index], self.created[index]
+        )
+
+    def grow(self, n: int) -> "_ReportColumns":
+        """Copy into arrays with room for at least ``n`` rows."""
+        grown = _ReportColumns.allocate(max(n, 2 * len(self)))
+        for name in ("ids", "lat", "lng", "category", "created"):
+            getattr(grown, name)[: len(self)] = getattr(self, name)
+        return grown
+
+
+@dataclass
+class _ClusterState:
+    """Report window and cluster labels carried between incremental runs."""
+
+    lat: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float64))
+    lng: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float64))
+    category: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int8))
+    created: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    labels: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    zone_ids: Dict[int, uuid.UUID] = field(default_factory=dict)
+    watermark: Optional[datetime] = None
+    # Raw ids of reports near the watermark, so the overlap re-read does
+    # not double-count them
+    boundary_ids: Dict[bytes, int] = field(default_factory=dict)
+    next_label: int = 0
+
+    def ingest(
+        self,
+        reports: _ReportColumns,
+        cutoff_epoch: float,
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, bool]]:
+        """
+        Append newly fetched reports and expire old ones.
+
+        Returns (changed_lat, changed_lng, full) describing what has to be
+        reclustered, or None if the window did not change. ``full`` is set
+        when no previous points survived, so the whole window is relabelled.
+        """
+        fresh = reports.created >= cutoff_epoch
+        if self.boundary_ids:
+            # Only re-read rows at or before the last watermark can be repeats
+            newest_seen = max(self.boundary_ids.values())
+            for k in np.flatnonzero(fresh & (reports.created <= newest_seen)).tolist():
+                if reports.ids[k].tobytes() in self.boundary_ids:
+                    fresh[k] = False
+        reports = reports.take(fresh)
+        self._advance_watermark(reports)
+
+        expired = self.created < cutoff_epoch
+        changed_lat = np.concatenate([self.lat[expired], reports.lat])
+        changed_lng = np.concatenate([self.lng[expired], reports.lng])
+        if len(changed_lat) == 0:
+            return None
+
+        keep = ~expired
+        full = not keep.any()
+        self.lat = np.concatenate([self.lat[keep], reports.lat])
+        self.lng = np.concatenate([self.lng[keep], reports.lng])
+        self.category = np.concatenate([self.category[keep], reports.category])
+        self.created = np.concatenate([self.created[keep], reports.created])
+        self.labels = np.concatenate([self.labels[keep], np.full(len(reports), -1, dtype=np.int64)])
+        return changed_lat, changed_lng, full
+
+    def _advance_watermark(self, reports: _ReportColumns) -> None:
+        if len(reports):
+            latest = int(reports.created.max())
+            if self.watermark is None or latest > self.watermark.timestamp():
+                self.watermark = datetime.fromtimestamp(latest, timezone.utc)
+        if self.watermark is None:
+            return
+        floor = int(self.watermark.timestamp()) - settings.RISK_WATERMARK_OVERLAP_S
+        near = reports.created >= floor
+        self.boundary_ids.update(
+            zip((rid.tobytes() for rid in reports.ids[near]), reports.created[near].tolist())
+        )
+        self.boundary_ids = {
+            rid: ts for rid, ts in self.boundary_ids.items() if ts >= floor
+        }
+
+    def relabel(
+        self,
+        touched: np.ndarray,
+        subset: np.ndarray,
+        subset_labels: np.ndarray,
+    ) -> Set[int]:
+        """
+        Replace labels of touched points with fresh ones from a subset run.
+        Returns the new labels, i.e. the clusters that must be rescored.
+        """
+        previous = self.labels.copy()
+        self.labels[touched] = -1
+
+        in_touched = np.isin(subset, touched)
+        members = subset[in_touched]
+        member_labels = subset_labels[in_touched]
+        clustered = member_labels >= 0
+        members, member_labels = members[clustered], member_labels[clustered]
+
+        uniq, inverse = np.unique(member_labels, return_inverse=True)
+        new_labels = self.next_label + np.arange(len(uniq), dtype=np.int64)
+        self.labels[members] = new_labels[inverse]
+        self.next_label += len(uniq)
+
+        # Each new cluster inherits the zone of the old cluster it overlaps most
+        old = previous[members]
+        has_old = old >= 0
+        zone_ids: Dict[int, uuid.UUID] = {}
+        if has_old.any():
+            # (new, old) label pairs packed into one int64 each: a flat sort
+            # is far cheaper than np.unique(axis=0) on a large window
+            base = self.next_label
+            pairs, counts = np.unique(new_labels[inverse][has_old] * base + old[has_old], return_counts=True)
+            claimed: Set[int] = set()
+            for pair in pairs[np.argsort(-counts, kind="stable")].tolist():
+                new_label, old_label = divmod(pair, base)
+                if new_label in zone_ids or old_label in claimed or old_label not in self.zone_ids:
+                    continue
+                claimed.add(old_label)
+                zone_ids[new_label] = self.zone_ids[old_label]
+
+        live = set(np.unique(self.labels).tolist())
+        self.zone_ids = {k: v for k, v in self.zone_ids.items() if k in live}
+        self.zone_ids.update(zone_ids)
+        return set(new_labels.tolist())
+
+
+_state = _ClusterState()
+_state_lock = asyncio.Lock()
+
+# Serialises runs across workers: held from the first query of a run to
+# the commit of its zones (key is "ORACLE" in ASCII)
+_CLUSTER_LOCK_SQL = text("SELECT pg_advisory_xact_lock(CAST(:key AS bigint))")
+_CLUSTER_LOCK_KEY = 0x4F5241434C45
+
+
+@dataclass
+class ZoneChange:
+    """A risk zone created or updated by a clustering run."""
+
+    zone_id: uuid.UUID
+    lat: float
+    lng: float
+    risk_score: int
+    created: bool
+
+    def to_dict(self) -> dict:
+        return {
+            "id": str(self.zone_id),
+            "centroid_lat": self.lat,
+            "centroid_lng": self.lng,
+            "risk_score": self.risk_score,
+            "created": self.created,
+        }
+
+
+@dataclass
+class ClusteringResult:
+    """Outcome of one run_clustering call."""
+
+    zones: List[ZoneChange] = field(default_factory=list)  # one per changed zone
+    clusters: int = 0    # live clusters after the run
+    reports: int = 0     # reports in the lookback window
+    duration_s: float = 0.0
+    retired: List[uuid.UUID] = field(default_factory=list)  # zones the decay sweep deactivated
+
+    @property
+    def count(self) -> int:
+        return len(self.zones)
+
+
+# Rows per server-side cursor round trip in _fetch_recent_reports
+_FETCH_CHUNK_ROWS = 20_000
+
 
 async def _fetch_recent_reports(
     db: AsyncSession,
-) -> List[Tuple[float, float, str, datetime]]:
+    since: Optional[datetime] = None,
+) -> _ReportColumns:
     """
-    Return (lat, lng, category, created_at) for reports within the
-    configured lookback window.
+    Stream reports within the configured lookback window into typed
+    arrays, optionally only those created since the given watermark
+    (minus RISK_WATERMARK_OVERLAP_S).
+
+    Rows come through a server-side cursor in chunks of _FETCH_CHUNK_ROWS
+    and are copied straight into arrays sized by a count query, so only
+    one chunk of row objects exists at a time. Category codes and epoch
+    seconds are computed in SQL.
     """
     cutoff = datetime.now(timezone.utc) - timedelta(days=settings.RISK_LOOKBACK_DAYS)
+    if since is not None:
+        cutoff = max(cutoff, since - timedelta(seconds=settings.RISK_WATERMARK_OVERLAP_S))
+    window = Report.created_at >= cutoff
+
+    expected = (await db.execute(select(func.count()).select_from(Report).where(window))).scalar_one()
+
     stmt = select(
+        Report.id,
         func.ST_Y(func.ST_GeomFromWKB(Report.location)).label("lat"),
         func.ST_X(func.ST_GeomFromWKB(Report.location)).label("lng"),
-        Report.category,
-        Report.created_at,
-    ).where(Report.created_at >= cutoff)
+        case(
+            {category.value: code for code, category in enumerate(CATEGORY_CODES)},
+            value=cast(Report.category, String),
+            else_=0,
+        ).label("category"),
+        cast(func.floor(func.extract("epoch", Report.created_at)), BigInteger).label("created"),
+    ).where(window).execution_options(yield_per=_FETCH_CHUNK_ROWS)
 
-    result = await db.execute(stmt)
-    return result.all()
+    reports = _ReportColumns.allocate(expected)
+    filled = 0
+    result = await db.stream(stmt)
+    async for chunk in result.partitions():
+        ids, lats, lngs, categories, created = zip(*chunk)
+        end = filled + len(chunk)
+        if end > len(reports):
+            # Reports committed between the count and the cursor
+            reports = reports.grow(end)
+        reports.ids[filled:end] = np.frombuffer(b"".join(rid.bytes for rid in ids), dtype="V16")
+        reports.lat[filled:end] = lats
+        reports.lng[filled:end] = lngs
+        reports.category[filled:end] = categories
+        reports.created[filled:end] = created
+        filled = end
 
+    return reports.take(slice(0, filled))
 
-def _cluster_reports(
-    reports: List[Tuple[float, float, str, datetime]],
-) -> List[List[Tuple[float, float, str, datetime]]]:
+
+# ── CPU-bound stage (runs in the clustering executor) ─────────
+#
+# Everything below takes and returns plain NumPy arrays and scalars so it
+# can be shipped to a worker process without touching settings or the DB.
+
+def _dbscan(
+    coords_rad: np.ndarray,
+    radius_m: float,
+    min_samples: int,
+) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Run DBSCAN on report coordinates.
-    eps is ~200 m converted to radians for haversine metric.
+    Run DBSCAN on report coordinates (radians, lat/lng order); returns
+    (labels, core-point mask). eps is radius_m converted to radians for
+    the haversine metric.
     """
-    if len(reports) < settings.RISK_CLUSTER_MIN_REPORTS:
-        return []
-
-    coords = np.array([[r[0], r[1]] for r in reports])
-    coords_rad = np.radians(coords)
+    core = np.zeros(len(coords_rad), dtype=bool)
+    if len(coords_rad) < min_samples:
+        return np.full(len(coords_rad), -1, dtype=np.int64), core
 
-    eps_rad = settings.RISK_CLUSTER_RADIUS_M / 6_371_000  # Earth radius in m
+    eps_rad = radius_m / EARTH_RADIUS_M
 
     db = DBSCAN(
         eps=eps_rad,
-        min_samples=settings.RISK_CLUSTER_MIN_REPORTS,
+        min_samples=min_samples,
         metric="haversine",
     )
-    labels = db.fit_predict(coords_rad)
+    labels = db.fit_predict(coords_rad).astype(np.int64)
+    core[db.core_sample_indices_] = True
+    return labels, core
+
+
+def _affected_neighbourhood(
+    coords_rad: np.ndarray,
+    labels: np.ndarray,
+    changed_rad: np.ndarray,
+    radius_m: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return (touched, subset) point indices for a local DBSCAN re-run.
+
+    touched – points within 2 × eps of a change plus every member of a
+              cluster that has such a point; these get new labels.
+    subset  – touched plus an eps halo, so core-point neighbour counts
+              near the edge of the touched region stay exact.
+
+    Distances are chords between unit vectors, which order points exactly
+    like great-circle distance; a nearest-neighbour query per point
+    returns flat arrays and holds the GIL only briefly, unlike per-point
+    neighbour lists.
+    """
+    eps_rad = radius_m / EARTH_RADIUS_M
+    xyz = _unit_vectors(coords_rad)
+
+    near, _ = cKDTree(_unit_vectors(changed_rad)).query(xyz, distance_upper_bound=_chord(2 * eps_rad))
+    near = np.flatnonzero(np.isfinite(near))
+    dirty_labels = np.unique(labels[near])
+    dirty_labels = dirty_labels[dirty_labels >= 0]
+
+    touched_mask = np.isin(labels, dirty_labels)
+    touched_mask[near] = True
+    touched = np.flatnonzero(touched_mask)
+
+    halo, _ = cKDTree(xyz[touched]).query(xyz, distance_upper_bound=_chord(eps_rad))
+    subset = np.flatnonzero(np.isfinite(halo))
+    return touched, subset
+
+
+def _unit_vectors(coords_rad: np.ndarray) -> np.ndarray:
+    """Unit vectors (x, y, z) of (lat, lng) radians."""
+    lat, lng = coords_rad[:, 0], coords_rad[:, 1]
+    return np.column_stack([np.cos(lat) * np.cos(lng), np.cos(lat) * np.sin(lng), np.sin(lat)])
+
+
+def _chord(angle_rad: float) -> float:
+    """
+    Chord length of a great-circle angle, a hair long so points at exactly
+    that distance are never dropped by rounding.
+    """
+    return 2 * np.sin(angle_rad / 2) * (1 + 1e-9)
+
+
+def _cluster_labels(
+    lat: np.ndarray,
+    lng: np.ndarray,
+    radius_m: float,
+    min_samples: int,
+    engine: str,
+) -> np.ndarray:
+    """Label points with the clustering engine selected by RISK_CLUSTER_ENGINE."""
+    return _cluster_core_labels(lat, lng, radius_m, min_samples, engine)[0]
+
+
+def _cluster_core_labels(
+    lat: np.ndarray,
+    lng: np.ndarray,
+    radius_m: float,
+    min_samples: int,
+    engine: str,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """_cluster_labels, also returning the core-point mask."""
+    if engine == "grid":
+        return grid_dbscan(lat, lng, radius_m, min_samples)
+    if engine == "dbscan":
+        return _dbscan(np.radians(np.column_stack([lat, lng])), radius_m, min_samples)
+    raise ValueError(f"Unknown RISK_CLUSTER_ENGINE: {engine!r}")
+
+
+def _cluster_tile_batch(
+    tiles: List[Tuple[np.ndarray, np.ndarray]],
+    radius_m: float,
+    min_samples: int,
+    engine: str,
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Cluster a batch of (lat, lng) tiles; returns (labels, core) per tile."""
+    return [
+        _cluster_core_labels(lat, lng, radius_m, min_samples, engine)
+        for lat, lng in tiles
+    ]
+
+
+def _summarise_clusters(
+    lat: np.ndarray,
+    lng: np.ndarray,
+    category: np.ndarray,
+    created: np.ndarray,
+    labels: np.ndarray,
+    wanted: np.ndarray,
+    now: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Return (centroid_lat, centroid_lng, realtime_score, hourly_profile,
+    evidence_at) for each label in ``wanted``, in the same order.
+    evidence_at is the newest member report's epoch seconds.
+    """
+    n_clusters = len(wanted)
+    if n_clusters == 0:
+        return (
+            np.empty(0),
+            np.empty(0),
+            np.empty(0, dtype=np.int64),
+            np.empty((0, 24), dtype=np.int16),
+            np.empty(0, dtype=np.int64),
+        )
+
+    # Position of every point's cluster within ``wanted`` (-1 = not wanted)
+    sorter = np.argsort(wanted, kind="stable")
+    pos = np.minimum(np.searchsorted(wanted, labels, sorter=sorter), n_clusters - 1)
+    slot = sorter[pos]
+    members = wanted[slot] == labels
+    slot = slot[members]
+
+    sizes = np.bincount(slot, minlength=n_clusters)
+    centroid_lat = np.bincount(slot, weights=lat[members], minlength=n_clusters) / sizes
+    centroid_lng = np.bincount(slot, weights=lng[members], minlength=n_clusters) / sizes
+    scores = _compute_realtime_scores(category[members], created[members], slot, n_clusters, now)
+    profiles = _compute_hourly_profiles(
+        _hourly_mass(category[members], created[members], slot, n_clusters, now)
+    )
+    evidence_at = np.zeros(n_clusters, dtype=np.int64)
+    np.maximum.at(evidence_at, slot, created[members])
+    return centroid_lat, centroid_lng, scores, profiles, evidence_at
 
-    clusters: dict[int, list] = {}
-    for idx, label in enumerate(labels):
-        if label == -1:
-            continue  # noise
-        clusters.setdefault(label, []).append(reports[idx])
 
-    return list(clusters.values())
+# Category weight per CATEGORY_CODES index, for array lookups
+_CATEGORY_WEIGHT_TABLE = np.array(
+    [CATEGORY_WEIGHTS.get(category, 1) for category in CATEGORY_CODES], dtype=np.float64
+)
 
 
-def _compute_realtime_score(
-    cluster: List[Tuple[float, float, str, datetime]],
-) -> int:
+def _compute_realtime_scores(
+    categories: np.ndarray,
+    created: np.ndarray,
+    clusters: np.ndarray,
+    n_clusters: int,
+    now: Optional[float] = None,
+) -> np.ndarray:
     """
-    Real-time risk score from crowd-sourced reports.
+    Real-time risk scores from crowd-sourced reports, for every cluster
+    of a run in one pass.
 
     Score = Σ(category_weight × recency_factor)
     Recency factor: 1.0 if < 1 day, 0.6 if < 3 days, 0.3 otherwise.
     Clamped to 0-100.
 
+    Takes the category codes, created_at epoch seconds and cluster index
+    (0 … n_clusters-1) of each member report. np.bincount sums each
+    cluster in report order, exactly like the v1 per-report loop.
+
     NOTE: This was previously named _compute_risk_score in v1.
     Renamed for clarity when NCRB blending was introduced.
     """
-    now = datetime.now(timezone.utc)
-    score = 0.0
+    if now is None:
+        now = datetime.now(timezone.utc).timestamp()
 
-    for _, _, category, created_at in cluster:
-        weight = CATEGORY_WEIGHTS.get(category, 1)
-        age = (now - created_at).total_seconds() / 86_400  # days
+    score = np.bincount(clusters, weights=_report_mass(categories, created, now), minlength=n_clusters)
 
-        if age < 1:
-            recency = 1.0
-        elif age < 3:
-            recency = 0.6
-        else:
-            recency = 0.3
+    # Normalise to 0-100
+    return np.minimum((score * 5).astype(np.int64), 100)
 
-        score += weight * recency
 
-    # Normalise to 0-100
-    return min(int(score * 5), 100)
+def _report_mass(categories: np.ndarray, created: np.ndarray, now: float) -> np.ndarray:
+    """category_weight × recency_factor of each report."""
+    weight = _CATEGORY_WEIGHT_TABLE[categories]
+    age = (now - created) / 86_400  # days
+    recency = np.select([age < 1, age < 3], [1.0, 0.6], default=0.3)
+    return weight * recency
 
 
-async def _compute_blended_risk_score(
-    cluster: List[Tuple[float, float, str, datetime]],
-    db: AsyncSession,
-) -> int:
+def _local_hours(created: np.ndarray) -> np.ndarray:
     """
-    Blended risk score combining real-time reports and NCRB baseline.
+    Hour of day in RISK_TIMEZONE of each epoch-seconds timestamp, with the
+    UTC offset in force at that moment (so reports either side of a DST
+    change land in their own local hour, as AT TIME ZONE does in SQL).
+    """
+    if len(created) == 0:
+        return np.empty(0, dtype=np.int64)
+    tz = ZoneInfo(settings.RISK_TIMEZONE)
+    # Offsets change on quarter-hour boundaries at most: one lookup per
+    # quarter hour the window spans (~3k for RISK_LOOKBACK_DAYS = 30)
+    quarter = created // 900
+    first = int(quarter.min())
+    offsets = np.array(
+        [
+            int(datetime.fromtimestamp(q * 900, tz).utcoffset().total_seconds())
+            for q in range(first, int(quarter.max()) + 1)
+        ],
+        dtype=np.int64,
+    )
+    return ((created + offsets[quarter - first]) // 3600 % 24).astype(np.int64)
+
+
+def _hourly_mass(
+    categories: np.ndarray,
+    created: np.ndarray,
+    clusters: np.ndarray,
+    n_clusters: int,
+    now: float,
+) -> np.ndarray:
+    """
+    Weighted report mass per (cluster, local hour of day), shape
+    (n_clusters, 24), by each report's local hour in RISK_TIMEZONE.
+    """
+    hour = _local_hours(created)
+    mass = np.bincount(
+        clusters * 24 + hour,
+        weights=_report_mass(categories, created, now),
+        minlength=n_clusters * 24,
+    )
+    return mass.reshape(n_clusters, 24)
+
+
+def _compute_hourly_profiles(mass: np.ndarray) -> np.ndarray:
+    """
+    Per-hour risk multipliers (percent, int16) from hourly report mass.
+
+    Each hour is smoothed with its neighbours (¼, ½, ¼, wrapping at
+    midnight) and shrunk towards a flat profile by RISK_HOURLY_PRIOR
+    weighted reports per hour, so a handful of reports cannot make one
+    hour extreme. A profile averages 100 and is capped at 400.
+    """
+    smoothed = 0.5 * mass + 0.25 * np.roll(mass, 1, axis=1) + 0.25 * np.roll(mass, -1, axis=1)
+    prior = settings.RISK_HOURLY_PRIOR
+    total = smoothed.sum(axis=1, keepdims=True)
+    factor = 24 * (smoothed + prior) / np.maximum(total + 24 * prior, 1e-9)
+    return np.clip(np.rint(factor * 100), 0, 400).astype(np.int16)
+
+
+def _compute_blended_risk_scores(
+    realtime_scores: np.ndarray,
+    baseline_score: float,
+) -> np.ndarray:
+    """
+    Blended risk scores combining real-time reports and NCRB baseline.
 
     Formula:
         Final = (Real-time Score × NCRB_REALTIME_WEIGHT)
@@ -142,85 +619,535 @@ async def _compute_blended_risk_score(
 
     Default weights: 0.6 real-time, 0.4 baseline.
 
+    The baseline is fetched once per run by the caller, and every
+    cluster of the run is blended in one call.
+
     BACKWARD COMPATIBILITY:
     If no NCRB baseline data exists (score == 0), the function
     returns 100% real-time score — identical to v1 behaviour.
     """
-    realtime_score = _compute_realtime_score(cluster)
-
-    # Fetch NCRB baseline score (cached per-request via DB query)
-    baseline_score = await get_city_baseline_score(db)
-
+    realtime_scores = np.asarray(realtime_scores, dtype=np.int64)
     if baseline_score == 0.0:
         # No NCRB data available — fall back to pure real-time scoring
         # This preserves v1 behaviour for cities without baseline data
-        logger.debug("NCRB: No baseline data, using 100% real-time score")
-        return realtime_score
+        return realtime_scores
 
-    # Blend real-time and baseline scores
+    # Blend real-time and baseline scores (np.round is half-to-even, like round())
     blended = (
-        realtime_score * settings.NCRB_REALTIME_WEIGHT
+        realtime_scores * settings.NCRB_REALTIME_WEIGHT
         + baseline_score * settings.NCRB_BASELINE_WEIGHT
     )
 
-    final_score = min(int(round(blended)), 100)
+    final_scores = np.minimum(np.round(blended).astype(np.int64), 100)
 
-    logger.info(
-        f"Oracle: Blended score = {final_score} "
-        f"(realtime={realtime_score} × {settings.NCRB_REALTIME_WEIGHT} "
+    logger.debug(
+        f"Oracle: Blended {len(final_scores)} score(s) "
+        f"(realtime × {settings.NCRB_REALTIME_WEIGHT} "
         f"+ baseline={baseline_score} × {settings.NCRB_BASELINE_WEIGHT})"
     )
-    return final_score
+    return final_scores
 
 
-async def run_clustering(db: AsyncSession) -> int:
+# ── In-database engine (RISK_CLUSTER_ENGINE = "postgis") ────
+#
+# ST_ClusterDBSCAN runs on Web Mercator, whose scale is sec(latitude), so
+# eps is stretched by 1 / cos(mean latitude) to stay ~RISK_CLUSTER_RADIUS_M
+# on the ground. Centroids and the category-weighted recency sum are
+# aggregated in the same statement: one row per cluster leaves the DB.
+_CLUSTER_IN_DB_SQL = text("""
+    WITH recent AS (
+        SELECT r.location::geometry AS geom, r.category::text AS category, r.created_at
+        FROM reports r
+        WHERE r.created_at >= :cutoff
+    ),
+    params AS (
+        SELECT CAST(:radius_m AS float8) / cos(radians(avg(ST_Y(geom)))) AS eps FROM recent
+    ),
+    clustered AS (
+        SELECT
+            ST_ClusterDBSCAN(ST_Transform(r.geom, 3857), p.eps, CAST(:min_samples AS int))
+                OVER () AS cid,
+            r.geom,
+            r.category,
+            r.created_at
+        FROM recent r CROSS JOIN params p
+    ),
+    weights AS (
+        SELECT *
+        FROM unnest(CAST(:categories AS text[]), CAST(:weights AS int[])) AS w(category, weight)
+    ),
+    scored AS (
+        SELECT
+            c.cid,
+            c.geom,
+            c.created_at,
+            extract(hour FROM c.created_at AT TIME ZONE :tz)::int AS hour,
+            COALESCE(w.weight, 1) * CASE
+                WHEN c.created_at > CAST(:now AS timestamptz) - interval '1 day'  THEN 1.0
+                WHEN c.created_at > CAST(:now AS timestamptz) - interval '3 days' THEN 0.6
+                ELSE 0.3
+            END AS mass
+        FROM clustered c
+        LEFT JOIN weights w ON w.category = c.category
+        WHERE c.cid IS NOT NULL
+    ),
+    hourly AS (
+        SELECT cid, array_agg(hour ORDER BY hour) AS hours, array_agg(mass ORDER BY hour) AS masses
+        FROM (SELECT cid, hour, sum(mass) AS mass FROM scored GROUP BY cid, hour) h
+        GROUP BY cid
+    )
+    SELECT
+        (SELECT count(*) FROM recent) AS window_reports,
+        avg(ST_Y(s.geom)) AS lat,
+        avg(ST_X(s.geom)) AS lng,
+        sum(s.mass) AS raw_score,
+        extract(epoch FROM max(s.created_at)) AS evidence_at,
+        h.hours,
+        h.masses
+    FROM scored s
+    JOIN hourly h USING (cid)
+    GROUP BY s.cid, h.hours, h.masses
+    ORDER BY s.cid
+""")
+
+
+async def _cluster_in_database(
+    db: AsyncSession,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, int]:
     """
-    Full clustering pipeline.
-    Returns the number of risk zones created / updated.
+    Cluster and score the report window inside PostGIS.
+    Returns (centroid_lat, centroid_lng, realtime_score, hourly_profile,
+    evidence_at) arrays and the number of reports in the window.
     """
-    reports = await _fetch_recent_reports(db)
-    clusters = _cluster_reports(reports)
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        _CLUSTER_IN_DB_SQL,
+        {
+            "cutoff": now - timedelta(days=settings.RISK_LOOKBACK_DAYS),
+            "now": now,
+            "radius_m": float(settings.RISK_CLUSTER_RADIUS_M),
+            "min_samples": settings.RISK_CLUSTER_MIN_REPORTS,
+            "categories": [c.value for c in CATEGORY_WEIGHTS],
+            "weights": list(CATEGORY_WEIGHTS.values()),
+            "tz": settings.RISK_TIMEZONE,
+        },
+    )
+    rows = result.all()
+    lats = np.array([r.lat for r in rows], dtype=np.float64)
+    lngs = np.array([r.lng for r in rows], dtype=np.float64)
+    # Same normalisation as _compute_realtime_scores
+    scores = np.array([min(int(float(r.raw_score) * 5), 100) for r in rows], dtype=np.int64)
+    evidence_at = np.array([int(r.evidence_at) for r in rows], dtype=np.int64)
+    mass = np.zeros((len(rows), 24))
+    for i, r in enumerate(rows):
+        mass[i, r.hours] = np.array(r.masses, dtype=np.float64)
+    return (
+        lats,
+        lngs,
+        scores,
+        _compute_hourly_profiles(mass),
+        evidence_at,
+        rows[0].window_reports if rows else 0,
+    )
 
-    if not clusters:
-        logger.info("Oracle: No clusters found")
-        return 0
-
-    count = 0
-    for cluster in clusters:
-        lats = [r[0] for r in cluster]
-        lngs = [r[1] for r in cluster]
-        centroid_lat = float(np.mean(lats))
-        centroid_lng = float(np.mean(lngs))
-
-        # v2: Use blended scoring (real-time + NCRB baseline)
-        risk_score = await _compute_blended_risk_score(cluster, db)
-
-        # Check if a zone already exists near this centroid
-        existing = await db.execute(
-            select(RiskZone).where(
-                func.ST_DWithin(
-                    RiskZone.centroid,
-                    func.ST_GeogFromText(f"POINT({centroid_lng} {centroid_lat})"),
-                    settings.RISK_CLUSTER_RADIUS_M,
+
+# Match every cluster centroid to an existing zone (previous-run hint first,
+# then nearest centroid within the cluster radius) and insert / update all
+# zones in a single round trip.
+_UPSERT_ZONES_SQL = text("""
+    WITH clusters AS (
+        SELECT
+            c.idx,
+            c.score,
+            c.hint,
+            c.new_id,
+            to_timestamp(c.evidence) AS evidence_at,
+            (CAST(:profiles AS smallint[]))[(c.idx - 1) * 24 + 1 : c.idx * 24] AS profile,
+            ST_SetSRID(ST_MakePoint(c.lng, c.lat), 4326)::geography AS pt
+        FROM unnest(
+            CAST(:lats AS float8[]),
+            CAST(:lngs AS float8[]),
+            CAST(:scores AS int[]),
+            CAST(:hints AS uuid[]),
+            CAST(:new_ids AS uuid[]),
+            CAST(:evidence_at AS float8[])
+        ) WITH ORDINALITY AS c(lat, lng, score, hint, new_id, evidence, idx)
+    ),
+    matched AS (
+        SELECT c.idx, COALESCE(h.id, n.id) AS zone_id
+        FROM clusters c
+        LEFT JOIN risk_zones h ON h.id = c.hint
+        LEFT JOIN LATERAL (
+            SELECT z.id
+            FROM risk_zones z
+            WHERE ST_DWithin(z.centroid, c.pt, :radius_m)
+            ORDER BY z.centroid <-> c.pt
+            LIMIT 1
+        ) n ON h.id IS NULL
+    ),
+    updated AS (
+        -- Authority / report zones take the cluster score but never its
+        -- evidence or profile, so the decay sweep keeps skipping them
+        UPDATE risk_zones z
+        SET risk_score     = GREATEST(z.risk_score, u.score),
+            evidence_score = CASE WHEN z.authority_id IS NULL AND z.source_report_id IS NULL
+                                  THEN GREATEST(z.risk_score, u.score)
+                                  ELSE z.evidence_score END,
+            evidence_at    = CASE WHEN z.authority_id IS NULL AND z.source_report_id IS NULL
+                                  THEN u.evidence_at
+                                  ELSE z.evidence_at END,
+            hourly_profile = CASE WHEN z.authority_id IS NULL AND z.source_report_id IS NULL
+                                  THEN u.profile
+                                  ELSE z.hourly_profile END,
+            updated_at     = now(),
+            active         = TRUE
+        FROM (
+            -- Highest-scoring cluster per zone, with its profile and evidence time
+            SELECT DISTINCT ON (m.zone_id) m.zone_id, c.score, c.profile, c.evidence_at
+            FROM matched m
+            JOIN clusters c USING (idx)
+            WHERE m.zone_id IS NOT NULL
+            ORDER BY m.zone_id, c.score DESC
+        ) u
+        WHERE z.id = u.zone_id
+        RETURNING
+            z.id,
+            z.risk_score,
+            ST_Y(z.centroid::geometry) AS lat,
+            ST_X(z.centroid::geometry) AS lng
+    ),
+    inserted AS (
+        INSERT INTO risk_zones (
+            id, centroid, risk_score, risk_level, active,
+            evidence_score, evidence_at, hourly_profile, created_at, updated_at
+        )
+        SELECT c.new_id, c.pt, c.score, 'MEDIUM', TRUE, c.score, c.evidence_at, c.profile, now(), now()
+        FROM clusters c
+        JOIN matched m USING (idx)
+        WHERE m.zone_id IS NULL
+        RETURNING id
+    )
+    SELECT
+        m.idx,
+        COALESCE(m.zone_id, c.new_id) AS zone_id,
+        m.zone_id IS NULL AS created,
+        COALESCE(u.risk_score, c.score) AS risk_score,
+        COALESCE(u.lat, ST_Y(c.pt::geometry)) AS lat,
+        COALESCE(u.lng, ST_X(c.pt::geometry)) AS lng
+    FROM matched m
+    JOIN clusters c USING (idx)
+    LEFT JOIN updated u ON u.id = m.zone_id
+    ORDER BY m.idx
+""")
+
+
+async def _upsert_risk_zones(
+    db: AsyncSession,
+    lats: np.ndarray,
+    lngs: np.ndarray,
+    scores: np.ndarray,
+    profiles: np.ndarray,
+    evidence_at: np.ndarray,
+    hints: List[Optional[uuid.UUID]],
+) -> List[ZoneChange]:
+    """
+    Create or update one risk zone per cluster centroid in one statement.
+
+    Existing zones keep max(current, new) risk_score, take the hourly
+    profile and evidence time (newest member report, epoch seconds) of
+    their highest-scoring cluster and are reactivated; the decay sweep
+    that follows each run retires them again if that evidence is stale.
+    Returns the resulting zone of each cluster, in input order.
+    """
+    result = await db.execute(
+        _UPSERT_ZONES_SQL,
+        {
+            "lats": lats.tolist(),
+            "lngs": lngs.tolist(),
+            "scores": [int(s) for s in scores],
+            "profiles": profiles.ravel().tolist(),  # n × 24, row-major
+            "hints": hints,
+            "new_ids": [uuid.uuid4() for _ in range(len(hints))],
+            "evidence_at": [float(t) for t in evidence_at],
+            "radius_m": settings.RISK_CLUSTER_RADIUS_M,
+        },
+    )
+    return [
+        ZoneChange(
+            zone_id=row.zone_id,
+            lat=row.lat,
+            lng=row.lng,
+            risk_score=row.risk_score,
+            created=row.created,
+        )
+        for row in result
+    ]
+
+
+# ── Decay / deactivation sweep ───────────────────────────────
+#
+# Every zone written by clustering records the score it was given and
+# the time of the newest report behind it (evidence_score / evidence_at),
+# so a zone whose reports stop coming decays even while they are still
+# in the window and its cluster is not rewritten. The sweep recomputes all scores
+# from those in one statement, halving them every RISK_DECAY_HALF_LIFE_H
+# hours, and deactivates zones that fall below RISK_DECAY_MIN_SCORE.
+# Recomputing from the evidence makes the result independent of how
+# often the sweep runs. Authority-created zones have no evidence_at and
+# never decay.
+_DECAY_ZONES_SQL = text("""
+    WITH decayed AS (
+        SELECT
+            z.id,
+            floor(
+                z.evidence_score * power(
+                    0.5,
+                    extract(epoch FROM now() - z.evidence_at) / CAST(:half_life_s AS float8)
                 )
-            )
+            )::int AS score
+        FROM risk_zones z
+        WHERE z.active AND z.evidence_at IS NOT NULL
+    ),
+    swept AS (
+        UPDATE risk_zones z
+        SET risk_score = d.score,
+            active     = d.score >= :min_score,
+            updated_at = now()
+        FROM decayed d
+        WHERE z.id = d.id AND d.score < z.risk_score
+        RETURNING z.id, z.active
+    )
+    SELECT id, active FROM swept
+""")
+
+
+async def decay_risk_zones(db: AsyncSession) -> List[uuid.UUID]:
+    """
+    Decay clustering zones by evidence age and retire the weak ones.
+    Returns the ids of the zones deactivated by this sweep.
+    """
+    result = await db.execute(
+        _DECAY_ZONES_SQL,
+        {
+            "half_life_s": settings.RISK_DECAY_HALF_LIFE_H * 3600,
+            "min_score": settings.RISK_DECAY_MIN_SCORE,
+        },
+    )
+    rows = result.all()
+    await db.commit()
+
+    retired = [r.id for r in rows if not r.active]
+    logger.info(f"Oracle: Decayed {len(rows)} risk zone(s), retired {len(retired)}")
+    return retired
+
+
+# ── Clustering executor ───────────────────────────────────────
+_executor: Optional[Executor] = None
+
+
+def _get_executor() -> Executor:
+    """Lazily create the pool that runs the CPU-bound clustering stage."""
+    global _executor
+    if _executor is None:
+        workers = max(1, settings.RISK_CLUSTER_WORKERS)
+        if settings.RISK_CLUSTER_EXECUTOR == "thread":
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="oracle")
+        else:
+            _executor = ProcessPoolExecutor(max_workers=workers)
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Stop clustering workers (called from the app lifespan on shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def _run_cpu(fn, *args):
+    """Run a CPU-bound stage in the clustering executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), fn, *args)
+
+
+async def _cluster_tiles(lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+    """
+    Cluster points tile by tile in the executor and stitch the results.
+    Falls back to a single engine call when tiling is off or everything
+    fits in one tile.
+    """
+    radius_m = settings.RISK_CLUSTER_RADIUS_M
+    min_samples = settings.RISK_CLUSTER_MIN_REPORTS
+    engine = settings.RISK_CLUSTER_ENGINE
+
+    tiles = []
+    if settings.RISK_TILE_SIZE_M > 0 and len(lat):
+        tile_m = max(settings.RISK_TILE_SIZE_M, 4 * radius_m)
+        tiles = await _run_cpu(partition_tiles, lat, lng, tile_m, radius_m)
+    if len(tiles) <= 1:
+        return await _run_cpu(_cluster_labels, lat, lng, radius_m, min_samples, engine)
+
+    # A few batches per worker keeps them busy without paying per-tile IPC
+    batches = batch_tiles(tiles, 4 * max(1, settings.RISK_CLUSTER_WORKERS))
+    batch_results = await asyncio.gather(*(
+        _run_cpu(
+            _cluster_tile_batch,
+            [(lat[tiles[t][0]], lng[tiles[t][0]]) for t in batch],
+            radius_m,
+            min_samples,
+            engine,
         )
-        zone = existing.scalar_one_or_none()
+        for batch in batches
+    ))
+    tile_results: List[Tuple[np.ndarray, np.ndarray]] = [None] * len(tiles)
+    for batch, results in zip(batches, batch_results):
+        for t, result in zip(batch, results):
+            tile_results[t] = result
+
+    labels = await _run_cpu(stitch_tile_labels, len(lat), tiles, tile_results)
+    logger.debug(f"Oracle: Clustered {len(lat)} report(s) in {len(tiles)} tile(s)")
+    return labels
 
-        if zone:
-            zone.risk_score = max(zone.risk_score, risk_score)
-            zone.updated_at = datetime.now(timezone.utc)
-            zone.active = True
+
+async def run_clustering(db: AsyncSession) -> ClusteringResult:
+    """
+    Full clustering pipeline.
+    Returns the risk zones created / updated plus run statistics.
+    """
+    global _state
+    async with _state_lock:
+        start = time.perf_counter()
+        # Released when _persist_clusters commits (or the session rolls back)
+        await db.execute(_CLUSTER_LOCK_SQL, {"key": _CLUSTER_LOCK_KEY})
+        if settings.RISK_CLUSTER_ENGINE == "postgis":
+            result = await _run_clustering_in_database(db)
         else:
-            zone = RiskZone(
-                centroid=point_to_wkt(centroid_lat, centroid_lng),
-                risk_score=risk_score,
-                active=True,
-            )
-            db.add(zone)
+            if not settings.RISK_INCREMENTAL_CLUSTERING:
+                _state = _ClusterState()
+            try:
+                result = await _run_clustering(db, _state)
+            except Exception:
+                # State may be ahead of the DB now; next run starts from scratch
+                _state = _ClusterState()
+                raise
+        result.duration_s = time.perf_counter() - start
+        return result
+
 
-        count += 1
+async def _update_clusters(state: _ClusterState, reports: _ReportColumns, cutoff_epoch: float) -> Set[int]:
+    """
+    Ingest newly fetched reports into ``state`` and recluster the
+    neighbourhood of the changes in the clustering executor.
+    Returns the labels of the clusters that must be rescored.
+    """
+    changed = state.ingest(reports, cutoff_epoch)
+    if changed is None:
+        return set()
+    changed_lat, changed_lng, full = changed
+    if full:
+        touched = subset = np.arange(len(state.lat), dtype=np.int64)
+    else:
+        touched, subset = await _run_cpu(
+            _affected_neighbourhood,
+            np.radians(np.column_stack([state.lat, state.lng])),
+            state.labels,
+            np.radians(np.column_stack([changed_lat, changed_lng])),
+            settings.RISK_CLUSTER_RADIUS_M,
+        )
+    subset_labels = await _cluster_tiles(state.lat[subset], state.lng[subset])
+    return state.relabel(touched, subset, subset_labels)
+
+
+async def _run_clustering(db: AsyncSession, state: _ClusterState) -> ClusteringResult:
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.RISK_LOOKBACK_DAYS)
+    reports = await _fetch_recent_reports(db, since=state.watermark)
+    affected = await _update_clusters(state, reports, cutoff.timestamp())
+
+    result = ClusteringResult(
+        clusters=len(np.unique(state.labels[state.labels >= 0])),
+        reports=len(state.lat),
+    )
+    if not affected:
+        if not result.clusters:
+            logger.info("Oracle: No clusters found")
+        else:
+            logger.info("Oracle: No cluster changes since last run")
+        return result
+
+    labels = np.array(sorted(affected), dtype=np.int64)
+    centroid_lats, centroid_lngs, realtime_scores, profiles, evidence_at = await _run_cpu(
+        _summarise_clusters,
+        state.lat,
+        state.lng,
+        state.category,
+        state.created,
+        state.labels,
+        labels,
+        datetime.now(timezone.utc).timestamp(),
+    )
+
+    zones = await _persist_clusters(
+        db,
+        centroid_lats,
+        centroid_lngs,
+        realtime_scores,
+        profiles,
+        evidence_at,
+        [state.zone_ids.get(label) for label in labels.tolist()],
+    )
+    for label, zone in zip(labels.tolist(), zones):
+        state.zone_ids[label] = zone.zone_id
+
+    result.zones = _distinct_zones(zones)
+    logger.info(f"Oracle: Processed {result.count} risk zone(s) ({result.reports} reports in window)")
+    return result
+
+
+async def _run_clustering_in_database(db: AsyncSession) -> ClusteringResult:
+    """Clustering pipeline for RISK_CLUSTER_ENGINE = "postgis"."""
+    centroid_lats, centroid_lngs, realtime_scores, profiles, evidence_at, window = await _cluster_in_database(db)
+
+    result = ClusteringResult(clusters=len(centroid_lats), reports=window)
+    if not len(centroid_lats):
+        logger.info("Oracle: No clusters found")
+        return result
+
+    zones = await _persist_clusters(
+        db,
+        centroid_lats,
+        centroid_lngs,
+        realtime_scores,
+        profiles,
+        evidence_at,
+        [None] * len(centroid_lats),
+    )
+    result.zones = _distinct_zones(zones)
+    logger.info(f"Oracle: Processed {result.count} risk zone(s) (clustered in PostGIS)")
+    return result
+
+
+def _distinct_zones(zones: List[ZoneChange]) -> List[ZoneChange]:
+    """Several clusters can land on one zone; keep its final state once."""
+    return list({zone.zone_id: zone for zone in zones}.values())
+
+
+async def _persist_clusters(
+    db: AsyncSession,
+    centroid_lats: np.ndarray,
+    centroid_lngs: np.ndarray,
+    realtime_scores: np.ndarray,
+    profiles: np.ndarray,
+    evidence_at: np.ndarray,
+    hints: List[Optional[uuid.UUID]],
+) -> List[ZoneChange]:
+    """Blend real-time scores with the NCRB baseline, upsert zones, commit."""
+    # v2: Use blended scoring (real-time + NCRB baseline)
+    baseline_score = await get_city_baseline_score(db)
+    if baseline_score == 0.0:
+        logger.debug("NCRB: No baseline data, using 100% real-time score")
+    scores = _compute_blended_risk_scores(realtime_scores, baseline_score)
 
+    zones = await _upsert_risk_zones(db, centroid_lats, centroid_lngs, scores, profiles, evidence_at, hints)
     await db.commit()
-    logger.info(f"Oracle: Processed {count} risk zone(s)")
-    return count
+    return zones
@@ -0,0 +1,269 @@
+"""
+Path Finder – City risk raster.
+
+A uint8 grid over RISK_RASTER_BBOX with RISK_RASTER_CELL_M cells. Each
+cell holds the highest score of the active zones that reach it, so "how
+risky is this point" becomes one array lookup and "does this route touch
+any zone" becomes a handful of gathers.
+
+Cells are conservative: a zone reaches a cell when its centroid is
+within RISK_CLUSTER_RADIUS_M plus the cell diagonal of the cell centre,
+or its polygon comes that close. Every point a zone touches therefore
+reads at least that zone's score, and a route that reads 0 everywhere
+touches no zone. A non-zero cell is only a candidate – it may read up
+to one cell diagonal too far out – so point() confirms it against the
+zones of the snapshot the raster was painted from.
+
+  - The raster follows the zone index: a repaint redoes only the windows
+    around zones that were added, removed or changed since the last
+    snapshot it saw (the first one paints everything).
+  - Repaints go into a copy of the grid, which is swapped in together
+    with the snapshot it was painted from, so readers never see a
+    half-painted grid.
+  - get_risk_raster() runs repaints in a worker thread, one at a time,
+    and answers None (callers fall back to their query) until the raster
+    has caught up with the zone index – the event loop never paints.
+
+The raster is process-local, like the zone index it follows: each worker
+paints its own grid (rows × cols bytes) from its own snapshots. Call
+get_risk_raster() on the event loop only.
+"""
+
+import asyncio
+import math
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import shapely
+
+from app.config.settings import get_settings
+from app.services.zone_index import ZoneSnapshot, zone_index
+from app.utils import EARTH_RADIUS_M, haversine_m, logger
+
+settings = get_settings()
+
+_M_PER_DEG_LAT = math.pi * EARTH_RADIUS_M / 180
+
+
+class RiskRaster:
+    """Max zone score per cell over a fixed lat/lng bounding box."""
+
+    def __init__(
+        self,
+        bbox: Tuple[float, float, float, float],
+        cell_m: float,
+        radius_m: float,
+    ):
+        self.min_lat, self.min_lng, self.max_lat, self.max_lng = bbox
+        self.cell_m = cell_m
+        self.d_lat = cell_m / _M_PER_DEG_LAT
+        self.d_lng = self.d_lat / math.cos(math.radians((self.min_lat + self.max_lat) / 2))
+        self.shape = (
+            max(1, math.ceil((self.max_lat - self.min_lat) / self.d_lat)),
+            max(1, math.ceil((self.max_lng - self.min_lng) / self.d_lng)),
+        )
+        # Reach of a zone: the cluster radius plus one cell diagonal
+        self.radius_m = radius_m
+        self.reach_m = radius_m + cell_m * math.sqrt(2)
+        self.grid = np.zeros(self.shape, dtype=np.uint8)
+        self.snapshot: Optional[ZoneSnapshot] = None
+        self.version: Optional[int] = None
+        self._stamps: Dict = {}
+
+    # ── Lookups ───────────────────────────────────────
+    def cells(self, lats: np.ndarray, lngs: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(row, col, inside) for lat/lng arrays; rows/cols are clipped."""
+        row = np.floor((np.asarray(lats) - self.min_lat) / self.d_lat).astype(np.int64)
+        col = np.floor((np.asarray(lngs) - self.min_lng) / self.d_lng).astype(np.int64)
+        inside = (row >= 0) & (row < self.shape[0]) & (col >= 0) & (col < self.shape[1])
+        return np.clip(row, 0, self.shape[0] - 1), np.clip(col, 0, self.shape[1] - 1), inside
+
+    def point(self, lat: float, lng: float) -> Optional[int]:
+        """
+        Risk at a point – the highest score of the zones whose centroid
+        is within the cluster radius or whose polygon contains it – or
+        None outside the raster.
+        """
+        row, col, inside = self.cells(np.array([lat]), np.array([lng]))
+        if not inside[0]:
+            return None
+        if not self.grid[row[0], col[0]]:
+            return 0
+
+        # Exact check of the candidate zones
+        snapshot = self.snapshot
+        pad_lat = self.radius_m / _M_PER_DEG_LAT
+        pad_lng = pad_lat / max(math.cos(math.radians(abs(lat) + pad_lat)), 1e-6)
+        zones = snapshot.tree.query(shapely.box(lng - pad_lng, lat - pad_lat, lng + pad_lng, lat + pad_lat))
+        if not len(zones):
+            return 0
+        hit = haversine_m(lat, lng, snapshot.lat[zones], snapshot.lng[zones]) <= self.radius_m
+        has_polygon = ~hit & (snapshot.polygons[zones] != None)  # noqa: E711
+        if has_polygon.any():
+            idx = np.flatnonzero(has_polygon)
+            hit[idx] = shapely.intersects(snapshot.polygons[zones[idx]], shapely.Point(lng, lat))
+        return int(snapshot.risk_score[zones[hit]].max()) if hit.any() else 0
+
+    def path_max(self, lats: np.ndarray, lngs: np.ndarray) -> Optional[int]:
+        """
+        Highest risk along a polyline, sampled every half cell, or None
+        if any of it leaves the raster.
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        if len(lats) > 1:
+            steps = np.maximum(
+                np.ceil(haversine_m(lats[:-1], lngs[:-1], lats[1:], lngs[1:]) / (self.cell_m / 2)), 1
+            ).astype(np.int64)
+            seg = np.repeat(np.arange(len(steps)), steps)
+            t = (np.arange(len(seg)) - np.repeat(np.cumsum(steps) - steps, steps)) / steps[seg]
+            lats = np.append(lats[seg] + t * (lats[seg + 1] - lats[seg]), lats[-1])
+            lngs = np.append(lngs[seg] + t * (lngs[seg + 1] - lngs[seg]), lngs[-1])
+        row, col, inside = self.cells(lats, lngs)
+        if not inside.all():
+            return None
+        return int(self.grid[row, col].max()) if len(row) else 0
+
+    # ── Painting ──────────────────────────────────────
+    def sync(self, snapshot: ZoneSnapshot) -> None:
+        """Bring the raster up to date with a zone snapshot."""
+        if snapshot.version != self.version:
+            self.swap_in(snapshot, *self.paint(snapshot))
+
+    def swap_in(self, snapshot: ZoneSnapshot, grid: np.ndarray, stamps: Dict) -> None:
+        """Make a grid painted by paint() current."""
+        self.grid = grid
+        self._stamps = stamps
+        self.snapshot = snapshot
+        self.version = snapshot.version
+
+    def paint(self, snapshot: ZoneSnapshot) -> Tuple[np.ndarray, Dict]:
+        """
+        Paint a copy of the grid for ``snapshot``; returns it with the
+        zone stamps to pass to swap_in(). Reads but never changes the
+        raster, so it can run off the event loop.
+        """
+        stamps = {
+            zone_id: (
+                int(snapshot.risk_score[i]),
+                float(snapshot.lat[i]),
+                float(snapshot.lng[i]),
+                None if snapshot.polygons[i] is None else snapshot.polygons[i].wkb,
+                snapshot.polygons[i],
+            )
+            for i, zone_id in enumerate(snapshot.ids)
+        }
+
+        if self.version is None:
+            grid = np.zeros(self.shape, dtype=np.uint8)
+            windows = [(0, self.shape[0], 0, self.shape[1])]
+        else:
+            grid = self.grid.copy()
+            # Windows of zones that appeared, vanished or changed – old and new extent
+            windows = []
+            for zone_id in stamps.keys() | self._stamps.keys():
+                old, new = self._stamps.get(zone_id), stamps.get(zone_id)
+                if old is not None and new is not None and old[:4] == new[:4]:
+                    continue
+                for stamp in (old, new):
+                    if stamp is not None:
+                        windows.append(self._zone_window(stamp[1], stamp[2], stamp[4]))
+
+        for window in windows:
+            self._repaint(grid, snapshot, window)
+        logger.info(f"PathFinder: Risk raster painted for zones v{snapshot.version} ({len(windows)} window(s))")
+        return grid, stamps
+
+    def _zone_window(self, lat: float, lng: float, polygon) -> Tuple[int, int, int, int]:
+        """Cell window (row0, row1, col0, col1) a zone can reach, clipped to the grid."""
+        if polygon is not None:
+            lng0, lat0, lng1, lat1 = polygon.bounds
+        else:
+            lat0 = lat1 = lat
+            lng0 = lng1 = lng
+        pad_lat = self.reach_m / _M_PER_DEG_LAT
+        pad_lng = pad_lat / max(math.cos(math.radians(max(abs(lat0), abs(lat1)) + pad_lat)), 1e-6)
+        r0 = math.floor((lat0 - pad_lat - self.min_lat) / self.d_lat)
+        r1 = math.floor((lat1 + pad_lat - self.min_lat) / self.d_lat) + 1
+        c0 = math.floor((lng0 - pad_lng - self.min_lng) / self.d_lng)
+        c1 = math.floor((lng1 + pad_lng - self.min_lng) / self.d_lng) + 1
+        return (
+            min(max(r0, 0), self.shape[0]),
+            min(max(r1, 0), self.shape[0]),
+            min(max(c0, 0), self.shape[1]),
+            min(max(c1, 0), self.shape[1]),
+        )
+
+    def _repaint(self, grid: np.ndarray, snapshot: ZoneSnapshot, window: Tuple[int, int, int, int]) -> None:
+        """Recompute one window of ``grid`` from every zone that can reach it."""
+        r0, r1, c0, c1 = window
+        if r0 >= r1 or c0 >= c1:
+            return
+        cell_lat = self.min_lat + (np.arange(r0, r1) + 0.5) * self.d_lat
+        cell_lng = self.min_lng + (np.arange(c0, c1) + 0.5) * self.d_lng
+        values = np.zeros((r1 - r0, c1 - c0), dtype=np.uint8)
+
+        if len(snapshot):
+            pad_lat = self.reach_m / _M_PER_DEG_LAT
+            pad_lng = pad_lat / max(math.cos(math.radians(np.abs(cell_lat).max() + pad_lat)), 1e-6)
+            box = shapely.box(
+                cell_lng[0] - pad_lng, cell_lat[0] - pad_lat, cell_lng[-1] + pad_lng, cell_lat[-1] + pad_lat
+            )
+            for z in snapshot.tree.query(box).tolist():
+                zr0, zr1, zc0, zc1 = self._zone_window(snapshot.lat[z], snapshot.lng[z], snapshot.polygons[z])
+                zr0, zr1 = max(zr0, r0) - r0, min(zr1, r1) - r0
+                zc0, zc1 = max(zc0, c0) - c0, min(zc1, c1) - c0
+                if zr0 >= zr1 or zc0 >= zc1:
+                    continue
+                lat, lng = np.meshgrid(cell_lat[zr0:zr1], cell_lng[zc0:zc1], indexing="ij")
+                reached = haversine_m(lat, lng, snapshot.lat[z], snapshot.lng[z]) <= self.reach_m
+                if snapshot.polygons[z] is not None:
+                    # Within one cell diagonal of the polygon (in degrees, taken
+                    # along longitude – the longer of the two – to stay conservative)
+                    reached |= shapely.dwithin(
+                        snapshot.polygons[z], shapely.points(lng, lat), math.hypot(self.d_lat, self.d_lng)
+                    )
+                sub = values[zr0:zr1, zc0:zc1]
+                np.maximum(sub, np.where(reached, np.uint8(snapshot.risk_score[z]), np.uint8(0)), out=sub)
+
+        grid[r0:r1, c0:c1] = values
+
+
+_raster: Optional[RiskRaster] = None
+_sync_task: Optional[asyncio.Task] = None
+
+
+def get_risk_raster() -> Optional[RiskRaster]:
+    """
+    The raster synced to the current zone index, or None if no bbox is
+    configured, the index is cold or the raster is behind it (callers
+    fall back to their query). A raster that is behind gets a background
+    repaint scheduled.
+    """
+    global _raster, _sync_task
+    if not settings.RISK_RASTER_BBOX:
+        return None
+    snapshot = zone_index.current()
+    if snapshot is None:
+        return None
+    if _raster is None:
+        bbox = tuple(float(v) for v in settings.RISK_RASTER_BBOX.split(","))
+        _raster = RiskRaster(
+            bbox,
+            settings.RISK_RASTER_CELL_M,
+            settings.RISK_CLUSTER_RADIUS_M,
+        )
+    if _raster.version == snapshot.version:
+        return _raster
+    if _sync_task is None or _sync_task.done():
+        _sync_task = asyncio.create_task(_sync(_raster, snapshot), name="risk-raster-sync")
+    return None
+
+
+async def _sync(raster: RiskRaster, snapshot: ZoneSnapshot) -> None:
+    try:
+        grid, stamps = await asyncio.to_thread(raster.paint, snapshot)
+    except Exception as exc:
+        logger.error(f"PathFinder: Risk raster repaint failed: {exc}")
+        return
+    raster.swap_in(snapshot, grid, stamps)
@@ -0,0 +1,188 @@
+"""
+Path Finder – Risk-aware routing on a local road graph.
+
+Suggests a safer walking route between two points, fully offline. The
+road graph is an OSM-derived .npz file (see build_road_graph.py) held
+in memory as compact CSR arrays:
+
+  node_lat, node_lng   float64 [n_nodes]
+  indptr               int64   [n_nodes + 1]  edges of node v are indptr[v]:indptr[v + 1]
+  indices              int32   [n_edges]      edge target node
+  length_m             float32 [n_edges]      edge length in metres
+
+Edge cost (metres-equivalent):
+
+  length × (1 + SAFE_ROUTE_RISK_WEIGHT × risk / 100 × ncrb_multiplier)
+
+where ``risk`` is the highest score of the active risk zones the edge
+touches (same centroid-radius / polygon test as route scoring) and
+``ncrb_multiplier`` comes from _get_ncrb_bias_multiplier. Costs are
+never below the edge length, so the straight-line distance to the
+destination is an admissible A* heuristic.
+
+Per-edge risk is recomputed only when the zone index version changes.
+"""
+
+import heapq
+import math
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from app.config.settings import get_settings
+from app.services.zone_index import ZoneSnapshot
+from app.utils import logger, project_local_m
+
+settings = get_settings()
+
+
+@dataclass
+class RoadGraph:
+    """Directed road graph in CSR form."""
+
+    node_lat: np.ndarray
+    node_lng: np.ndarray
+    indptr: np.ndarray
+    indices: np.ndarray
+    length_m: np.ndarray
+    # Derived at load time
+    edge_source: np.ndarray = field(init=False)
+    _lat0: float = field(init=False)
+    _tree: cKDTree = field(init=False)
+    _adjacency: Tuple[list, list] = field(init=False)
+    _xy: Tuple[list, list] = field(init=False)
+    _risk_cache: Dict[int, np.ndarray] = field(init=False)
+
+    def __post_init__(self):
+        self.edge_source = np.repeat(
+            np.arange(len(self.node_lat), dtype=np.int32), np.diff(self.indptr)
+        )
+        self._lat0 = float(self.node_lat.mean()) if len(self.node_lat) else 0.0
+        x, y = project_local_m(self.node_lat, self.node_lng, self._lat0)
+        self._tree = cKDTree(np.column_stack([x, y]))
+        # A* walks the graph in Python: plain lists index much faster
+        self._adjacency = (self.indptr.tolist(), self.indices.tolist())
+        self._xy = (x.tolist(), y.tolist())
+        self._risk_cache = {}
+
+    @classmethod
+    def load(cls, path: str) -> "RoadGraph":
+        with np.load(path) as data:
+            return cls(
+                node_lat=data["node_lat"].astype(np.float64),
+                node_lng=data["node_lng"].astype(np.float64),
+                indptr=data["indptr"].astype(np.int64),
+                indices=data["indices"].astype(np.int32),
+                length_m=data["length_m"].astype(np.float32),
+            )
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.node_lat)
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.indices)
+
+    def nearest_node(self, lat: float, lng: float) -> Tuple[int, float]:
+        """(node, approximate distance in metres) of the node closest to a point."""
+        x, y = project_local_m(np.array([lat]), np.array([lng]), lat0=self._lat0)
+        distance, node = self._tree.query([x[0], y[0]])
+        return int(node), float(distance)
+
+    def edge_risk(self, snapshot: ZoneSnapshot) -> np.ndarray:
+        """Highest touching zone score per edge (0 = none), cached per zone version."""
+        cached = self._risk_cache.get(snapshot.version)
+        if cached is not None:
+            return cached
+
+        source, target = self.edge_source, self.indices
+        edge, zone = snapshot.query_segments(
+            self.node_lat[source],
+            self.node_lng[source],
+            self.node_lat[target],
+            self.node_lng[target],
+            settings.RISK_CLUSTER_RADIUS_M,
+        )
+        risk = np.zeros(self.n_edges, dtype=np.float32)
+        np.maximum.at(risk, edge, snapshot.risk_score[zone].astype(np.float32))
+
+        # Keep only the current version (snapshots from cold fallbacks use -1)
+        if snapshot.version >= 0:
+            self._risk_cache = {snapshot.version: risk}
+        return risk
+
+    def edge_cost(self, snapshot: ZoneSnapshot, ncrb_multiplier: float) -> np.ndarray:
+        risk = self.edge_risk(snapshot)
+        weight = settings.SAFE_ROUTE_RISK_WEIGHT * ncrb_multiplier / 100.0
+        return self.length_m * (1.0 + weight * risk)
+
+    def shortest_path(self, source: int, target: int, cost: np.ndarray) -> Optional[List[int]]:
+        """A* from source to target over per-edge ``cost``; None if unreachable."""
+        if source == target:
+            return [source]
+
+        indptr, indices = self._adjacency
+        x, y = self._xy
+        cost = cost.tolist()
+        tx, ty = x[target], y[target]
+        # Projected distances can run ~1 % long across a city; shrink the
+        # heuristic so it stays admissible.
+        scale = 0.99
+
+        def heuristic(v: int) -> float:
+            return scale * math.hypot(x[v] - tx, y[v] - ty)
+
+        best = {source: 0.0}
+        parent = {source: -1}
+        heap = [(heuristic(source), 0.0, source)]
+        closed = set()
+        while heap:
+            _, g, v = heapq.heappop(heap)
+            if v in closed:
+                continue
+            if v == target:
+                path = [v]
+                while parent[path[-1]] != -1:
+                    path.append(parent[path[-1]])
+                return path[::-1]
+            closed.add(v)
+            for e in range(indptr[v], indptr[v + 1]):
+                w = indices[e]
+                if w in closed:
+                    continue
+                g_w = g + cost[e]
+                if g_w < best.get(w, math.inf):
+                    best[w] = g_w
+                    parent[w] = v
+                    heapq.heappush(heap, (g_w + heuristic(w), g_w, w))
+        return None
+
+    def path_length_m(self, path: List[int]) -> float:
+        """Length of a node path, summed over its edges."""
+        total = 0.0
+        for v, w in zip(path, path[1:]):
+            start, end = self.indptr[v], self.indptr[v + 1]
+            edges = start + np.flatnonzero(self.indices[start:end] == w)
+            total += float(self.length_m[edges].min())
+        return total
+
+
+_graph: Optional[RoadGraph] = None
+
+
+def get_road_graph() -> Optional[RoadGraph]:
+    """The road graph from ROAD_GRAPH_PATH, loaded once; None if not configured."""
+    global _graph
+    if _graph is None and settings.ROAD_GRAPH_PATH:
+        if not os.path.exists(settings.ROAD_GRAPH_PATH):
+            logger.warning(f"PathFinder: Road graph {settings.ROAD_GRAPH_PATH} not found")
+            return None
+        _graph = RoadGraph.load(settings.ROAD_GRAPH_PATH)
+        logger.info(
+            f"PathFinder: Road graph loaded ({_graph.n_nodes:,} nodes, {_graph.n_edges:,} edges)"
+        )
+    return _graph
@@ -0,0 +1,110 @@
+"""
+Path Finder – Route score cache.
+
+Popular routes are rescored with identical polylines over and over. This
+bounded LRU cache sits in front of score_route:
+
+  - Keys are a hash of the encoded polyline (and departure hour, when
+    scored for one) plus the zone index version,
+    so any zone insert, update or deactivation (all of which call
+    zone_index.invalidate()) makes every cached score unreachable. The
+    cache drops them the first time it sees a new version.
+  - Entries also expire after ROUTE_CACHE_TTL_S, which bounds staleness
+    for zone changes made by another process.
+  - Hit, miss and eviction counters are exposed through stats() for
+    monitoring (GET /route/cache/stats).
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.config.settings import get_settings
+from app.schemas import RouteScoreResponse
+from app.services.zone_index import zone_index
+
+settings = get_settings()
+
+
+class RouteScoreCache:
+    """Process-local LRU + TTL cache of RouteScoreResponse by polyline."""
+
+    def __init__(self, max_size: int, ttl_s: float):
+        self.max_size = max_size
+        self.ttl_s = ttl_s
+        self._entries: "OrderedDict[bytes, Tuple[float, RouteScoreResponse]]" = OrderedDict()
+        self._version = zone_index.version
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(encoded_polyline: str, hour: Optional[int]) -> bytes:
+        digest = hashlib.blake2b(encoded_polyline.encode(), digest_size=16)
+        if hour is not None:
+            digest.update(bytes([hour]))
+        return digest.digest()
+
+    def _sync_version(self) -> None:
+        """Drop every entry once the zone set has changed."""
+        version = zone_index.version
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+            self.invalidations += 1
+
+    def get(self, encoded_polyline: str, hour: Optional[int] = None) -> Optional[RouteScoreResponse]:
+        if self.max_size <= 0:
+            return None
+        self._sync_version()
+        key = self._key(encoded_polyline, hour)
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] >= self.ttl_s:
+            if entry is not None:
+                del self._entries[key]
+                self.evictions += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(
+        self,
+        encoded_polyline: str,
+        result: RouteScoreResponse,
+        version: int,
+        hour: Optional[int] = None,
+    ) -> None:
+        """Store a score computed against zone index ``version``."""
+        if self.max_size <= 0:
+            return
+        self._sync_version()
+        if version != self._version:
+            return  # zones changed while it was being scored
+        key = self._key(encoded_polyline, hour)
+        self._entries[key] = (time.monotonic(), result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_s": self.ttl_s,
+            "zone_version": self._version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Singleton
+route_cache = RouteScoreCache(settings.ROUTE_CACHE_SIZE, settings.ROUTE_CACHE_TTL_S)
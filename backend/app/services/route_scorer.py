@@ -19,10 +19,16 @@ NCRB INTEGRATION (v2):
 ─────────────────────────────────────────────────────────────────────
 """
 
-from typing import List
+import asyncio
+from datetime import datetime
+from typing import List, Optional, Tuple
+from zoneinfo import ZoneInfo
 
+import numpy as np
 import polyline as polyline_lib
-from sqlalchemy import func, select
+import shapely
+from geoalchemy2 import Geography
+from sqlalchemy import cast, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.settings import get_settings
@@ -30,11 +36,18 @@ from app.models import RiskZone
 from app.schemas import (
     HighRiskSegment,
     PointSchema,
+    RankedRouteScore,
     RouteRecommendation,
+    RouteExposureResponse,
     RouteScoreResponse,
+    SafeRouteResponse,
 )
 from app.services.ncrb_baseline import get_city_baseline_index
-from app.utils import logger
+from app.services.risk_raster import RiskRaster, get_risk_raster
+from app.services.road_graph import RoadGraph
+from app.services.route_cache import route_cache
+from app.services.zone_index import ZoneSnapshot, build_snapshot, zone_columns, zone_index
+from app.utils import haversine_m, logger, segment_disc_span, simplify_polyline
 
 settings = get_settings()
 
@@ -66,18 +79,130 @@ async def _get_ncrb_bias_multiplier(db: AsyncSession) -> float:
     return 1.0
 
 
-async def score_route(
-    encoded_polyline: str,
+async def _zones_near_route(
+    coords: List[tuple],
     db: AsyncSession,
-) -> RouteScoreResponse:
+) -> ZoneSnapshot:
     """
-    1. Decode the polyline to a list of (lat, lng) points.
-    2. Convert to WKT LineString.
-    3. Check intersection with active risk zone polygons.
-    4. Return HIGH_RISK if it intersects a high or moderate risk zone polygon.
+    Zones to test the route against: the in-memory zone index, or – while
+    it is cold – a one-off snapshot of the zones PostGIS finds near the route.
     """
-    coords: List[tuple] = polyline_lib.decode(encoded_polyline)
+    snapshot = zone_index.current()
+    if snapshot is not None:
+        return snapshot
+
+    # Query with a simplified line, widened by the simplification tolerance
+    # so the candidates are a superset; the caller's exact test runs on the
+    # full route, so the touched zones never change.
+    lats = np.array([c[0] for c in coords], dtype=np.float64)
+    lngs = np.array([c[1] for c in coords], dtype=np.float64)
+    tolerance_m = settings.ROUTE_SIMPLIFY_FRACTION * settings.RISK_CLUSTER_RADIUS_M
+    keep = simplify_polyline(lats, lngs, tolerance_m)
+
+    # Convert coordinates to WKT LineString (lng lat)
+    line_wkt = "LINESTRING(" + ", ".join(f"{lngs[i]} {lats[i]}" for i in keep.tolist()) + ")"
+    route = func.ST_GeogFromText(line_wkt)
+
+    # Zone centroid within the cluster radius, or zone polygon crossing the route
+    stmt = select(*zone_columns()).where(
+        RiskZone.active == True,
+        or_(
+            func.ST_DWithin(RiskZone.centroid, route, settings.RISK_CLUSTER_RADIUS_M + tolerance_m),
+            func.ST_DWithin(RiskZone.polygon, route, tolerance_m)
+            if tolerance_m > 0
+            else func.ST_Intersects(RiskZone.polygon, route),
+        ),
+    )
+    return build_snapshot((await db.execute(stmt)).all(), version=-1)
+
+
+async def _zones_near_routes(
+    routes: List[List[tuple]],
+    db: AsyncSession,
+) -> ZoneSnapshot:
+    """
+    Like _zones_near_route for several routes at once: while the index is
+    cold, one query loads the zones near the routes' combined bounding box.
+    """
+    snapshot = zone_index.current()
+    if snapshot is not None:
+        return snapshot
+
+    lats = [c[0] for coords in routes for c in coords]
+    lngs = [c[1] for coords in routes for c in coords]
+    bbox = cast(func.ST_MakeEnvelope(min(lngs), min(lats), max(lngs), max(lats), 4326), Geography)
+
+    stmt = select(*zone_columns()).where(
+        RiskZone.active == True,
+        or_(
+            func.ST_DWithin(RiskZone.centroid, bbox, settings.RISK_CLUSTER_RADIUS_M),
+            func.ST_Intersects(RiskZone.polygon, bbox),
+        ),
+    )
+    return build_snapshot((await db.execute(stmt)).all(), version=-1)
+
+
+def _segment_scores(n_seg: int, seg: np.ndarray, scores: np.ndarray) -> np.ndarray:
+    """Highest zone score touching each segment; -1 where none does."""
+    seg_score = np.full(n_seg, -1, dtype=np.int64)
+    np.maximum.at(seg_score, seg, scores)
+    return seg_score
+
+
+def _exposure_ranges(
+    lats: np.ndarray,
+    lngs: np.ndarray,
+    seg: np.ndarray,
+    scores: np.ndarray,
+) -> List[HighRiskSegment]:
+    """
+    Merge runs of consecutive exposed segments into HighRiskSegment
+    ranges, each carrying the highest zone score along it.
+    """
+    seg_score = _segment_scores(len(lats) - 1, seg, scores)
+    exposed = seg_score >= 0
+
+    edges = np.diff(np.concatenate([[0], exposed.astype(np.int8), [0]]))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)  # exclusive: range covers points start … end
+    if len(starts) == 0:
+        return []
+    range_scores = np.maximum.reduceat(seg_score, starts)
 
+    return [
+        HighRiskSegment(
+            start=PointSchema(lat=float(lats[start]), lng=float(lngs[start])),
+            end=PointSchema(lat=float(lats[end]), lng=float(lngs[end])),
+            risk_score=int(score),
+        )
+        for start, end, score in zip(starts.tolist(), ends.tolist(), range_scores.tolist())
+    ]
+
+
+def _local_hour(departure_time: Optional[datetime]) -> Optional[int]:
+    """Hour of day of a departure in RISK_TIMEZONE (naive times are local)."""
+    if departure_time is None:
+        return None
+    tz = ZoneInfo(settings.RISK_TIMEZONE)
+    if departure_time.tzinfo is None:
+        departure_time = departure_time.replace(tzinfo=tz)
+    return departure_time.astimezone(tz).hour
+
+
+def _score_coords(
+    coords: List[tuple],
+    snapshot: Optional[ZoneSnapshot],
+    hour: Optional[int] = None,
+    raster: Optional[RiskRaster] = None,
+) -> RouteScoreResponse:
+    """
+    Score one decoded route against a zone snapshot, with zone scores
+    for the given local hour (None = all-day scores).
+
+    ``raster`` is the risk raster from get_risk_raster(), resolved by the
+    caller on the event loop: this function also runs in worker threads,
+    where the zone index must not be touched.
+    """
     if len(coords) < 2:
         return RouteScoreResponse(
             route_risk_score=0,
@@ -85,30 +210,37 @@ async def score_route(
             recommendation=RouteRecommendation.SAFE,
         )
 
-    # Convert coordinates to WKT LineString (lng lat)
-    line_wkt = "LINESTRING(" + ", ".join([f"{c[1]} {c[0]}" for c in coords]) + ")"
+    lats = np.array([c[0] for c in coords], dtype=np.float64)
+    lngs = np.array([c[1] for c in coords], dtype=np.float64)
 
-    # Check for direct intersection with active risk zone centroids within their radius
-    stmt = select(RiskZone).where(
-        RiskZone.active == True,
-        func.ST_DWithin(
-            RiskZone.centroid,
-            func.ST_GeogFromText(line_wkt),
-            settings.RISK_CLUSTER_RADIUS_M
+    # Risk raster cells are conservative: a route reading 0 along its whole
+    # length touches no zone, so skip the segment test
+    if raster is not None and raster.version == snapshot.version and raster.path_max(lats, lngs) == 0:
+        return RouteScoreResponse(
+            route_risk_score=0.0,
+            high_risk_segments=[],
+            recommendation=RouteRecommendation.SAFE,
         )
-    )
-    result = await db.execute(stmt)
-    intersecting_zones = result.scalars().all()
 
-    # Determine if any intersected zone is HIGH or MEDIUM risk
+    seg, zone = snapshot.query_route(lats, lngs, settings.RISK_CLUSTER_RADIUS_M)
+    touched = np.unique(zone)
+    scores = snapshot.scores_at(hour)
+
+    # A touched HIGH or MEDIUM zone is dangerous while its score at this
+    # hour is at least what keeps a zone active (RISK_DECAY_MIN_SCORE): a
+    # zone that is quiet at night does not flag a night-time route
     # MEDIUM zones should also be considered dangerous for "Safe" recommendations
-    is_dangerous = any(z.risk_level in ["HIGH", "MEDIUM"] for z in intersecting_zones)
-    
+    dangerous = touched[
+        np.isin(snapshot.risk_level[touched], ["HIGH", "MEDIUM"])
+        & (scores[touched] >= settings.RISK_DECAY_MIN_SCORE)
+    ]
+    is_dangerous = len(dangerous) > 0
+
     # Calculate a simple aggregate score
     total_risk_score = 0.0
-    if intersecting_zones:
+    if len(touched):
         # Sum of risk scores of intersected zones, capped at 100
-        total_risk_score = min(sum(z.risk_score for z in intersecting_zones), 100)
+        total_risk_score = min(int(scores[touched].sum()), 100)
 
     recommendation = (
         RouteRecommendation.HIGH_RISK
@@ -116,22 +248,243 @@ async def score_route(
         else RouteRecommendation.SAFE
     )
 
+    # Exact exposed stretches of the route, with the zone scores along them
     high_risk_segments: List[HighRiskSegment] = []
-    # Optionally flag segments that are actually inside polygons (simplified for now)
-    # In a full impl, we'd use ST_Intersection to find exact sub-segments
     if is_dangerous:
-        # Flag the first half as a placeholder for UI rendering if needed
-        mid = len(coords) // 2
-        high_risk_segments.append(
-            HighRiskSegment(
-                start=PointSchema(lat=coords[0][0], lng=coords[0][1]),
-                end=PointSchema(lat=coords[mid][0], lng=coords[mid][1]),
-                risk_score=100
-            )
-        )
+        hit = np.isin(zone, dangerous)
+        high_risk_segments = _exposure_ranges(lats, lngs, seg[hit], scores[zone[hit]])
 
     return RouteScoreResponse(
         route_risk_score=float(total_risk_score),
         high_risk_segments=high_risk_segments,
         recommendation=recommendation,
     )
+
+
+def _exposure_intervals(
+    lats: np.ndarray,
+    lngs: np.ndarray,
+    snapshot: ZoneSnapshot,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (segment, t0, t1, zone) for every stretch of the route inside a zone:
+    segment ``segment`` is inside ``zone`` from fraction t0 to t1 of its
+    length. A stretch is the segment's chord through the zone's radius
+    disc, widened to where it crosses the zone's polygon, if any.
+    """
+    radius_m = settings.RISK_CLUSTER_RADIUS_M
+    seg, zone = snapshot.query_route(lats, lngs, radius_m)
+    a_lat, a_lng, b_lat, b_lng = lats[seg], lngs[seg], lats[seg + 1], lngs[seg + 1]
+    t0, t1 = segment_disc_span(snapshot.lat[zone], snapshot.lng[zone], radius_m, a_lat, a_lng, b_lat, b_lng)
+
+    with_polygon = np.flatnonzero(snapshot.polygons[zone] != None)  # noqa: E711
+    if len(with_polygon):
+        lines = shapely.linestrings(
+            np.stack([
+                np.column_stack([a_lng[with_polygon], a_lat[with_polygon]]),
+                np.column_stack([b_lng[with_polygon], b_lat[with_polygon]]),
+            ], axis=1)
+        )
+        crossing = shapely.intersection(snapshot.polygons[zone[with_polygon]], lines)
+        points, which = shapely.get_coordinates(crossing, return_index=True)
+        if len(which):
+            i = with_polygon[which]
+            k = np.cos(np.radians((a_lat[i] + b_lat[i]) / 2))
+            dx, dy = (b_lng[i] - a_lng[i]) * k, b_lat[i] - a_lat[i]
+            length2 = dx * dx + dy * dy
+            t = np.divide(
+                (points[:, 0] - a_lng[i]) * k * dx + (points[:, 1] - a_lat[i]) * dy,
+                length2,
+                out=np.zeros(len(i)),
+                where=length2 > 0,
+            )
+            np.minimum.at(t0, i, np.clip(t, 0.0, 1.0))
+            np.maximum.at(t1, i, np.clip(t, 0.0, 1.0))
+
+    keep = t0 <= t1
+    return seg[keep], t0[keep], t1[keep], zone[keep]
+
+
+def _exposure_profile(
+    coords: List[tuple],
+    snapshot: Optional[ZoneSnapshot],
+    samples: int,
+) -> RouteExposureResponse:
+    """
+    Risk along a decoded route, max-pooled into ``samples`` equal-distance
+    bins so short hot spots survive the downsampling. Only the stretches
+    actually inside a zone count as exposed.
+    """
+    if len(coords) < 2:
+        return RouteExposureResponse(
+            total_distance_m=0, exposed_distance_m=0, max_risk=0, distance_m=[], risk=[]
+        )
+
+    lats = np.array([c[0] for c in coords], dtype=np.float64)
+    lngs = np.array([c[1] for c in coords], dtype=np.float64)
+    length = haversine_m(lats[:-1], lngs[:-1], lats[1:], lngs[1:])
+    end = np.cumsum(length)
+    total = float(end[-1])
+
+    # Exposed intervals [lo, hi] in metres along the route, with their zone scores
+    seg, t0, t1, zone = _exposure_intervals(lats, lngs, snapshot)
+    lo = end[seg] - (1.0 - t0) * length[seg]
+    hi = end[seg] - (1.0 - t1) * length[seg]
+    score = snapshot.risk_score[zone]
+
+    # Exposed metres: length of the union of the intervals
+    order = np.argsort(lo, kind="stable")
+    lo_sorted, hi_sorted = lo[order], hi[order]
+    reach = np.concatenate([[-np.inf], np.maximum.accumulate(hi_sorted)[:-1]])
+    exposed_m = float(np.maximum(hi_sorted - np.maximum(lo_sorted, reach), 0.0).sum())
+
+    # Bins each interval overlaps: [start, end) in distance along the route
+    # (overlaps under a millimetre are rounding, not exposure)
+    samples = max(1, samples) if total > 0 else 1
+    step = total / samples if total > 0 else 1.0
+    first = np.minimum((lo + 1e-3) // step, samples - 1).astype(np.int64)
+    last = np.minimum(np.maximum(np.ceil((hi - 1e-3) / step) - 1, first), samples - 1).astype(np.int64)
+    spans = last - first + 1
+    bins = np.repeat(first, spans) + (np.arange(spans.sum()) - np.repeat(np.cumsum(spans) - spans, spans))
+    risk = np.zeros(samples, dtype=np.int64)
+    np.maximum.at(risk, bins, np.repeat(score, spans))
+
+    return RouteExposureResponse(
+        total_distance_m=round(total, 1),
+        exposed_distance_m=round(exposed_m, 1),
+        max_risk=int(score.max()) if len(score) else 0,
+        distance_m=np.rint(np.arange(1, samples + 1) * step).astype(np.int64).tolist(),
+        risk=risk.tolist(),
+    )
+
+
+async def route_exposure(
+    encoded_polyline: str,
+    samples: int,
+    db: AsyncSession,
+) -> RouteExposureResponse:
+    """Downsampled risk-along-route profile for a polyline."""
+    coords: List[tuple] = polyline_lib.decode(encoded_polyline)
+    if len(coords) < 2:
+        return _exposure_profile(coords, None, samples)
+    return _exposure_profile(coords, await _zones_near_route(coords, db), samples)
+
+
+async def score_route(
+    encoded_polyline: str,
+    db: AsyncSession,
+    departure_time: Optional[datetime] = None,
+) -> RouteScoreResponse:
+    """
+    1. Decode the polyline to a list of (lat, lng) points.
+    2. Find the active risk zones each segment touches (in-memory zone
+       index, PostGIS while the index is cold).
+    3. Return HIGH_RISK if it touches a high or moderate risk zone, with
+       the exposed stretches merged into scored segments.
+
+    With a departure time, zones are scored with their hourly profile
+    for that local hour. Scores are cached per polyline and hour until
+    the zone set changes.
+    """
+    hour = _local_hour(departure_time)
+    cached = route_cache.get(encoded_polyline, hour)
+    if cached is not None:
+        return cached
+
+    version = zone_index.version
+    coords: List[tuple] = polyline_lib.decode(encoded_polyline)
+    if len(coords) < 2:
+        result = _score_coords(coords, None)
+    else:
+        snapshot = await _zones_near_route(coords, db)
+        result = _score_coords(coords, snapshot, hour, get_risk_raster())
+    route_cache.put(encoded_polyline, result, version, hour)
+    return result
+
+
+async def score_routes(
+    encoded_polylines: List[str],
+    db: AsyncSession,
+    departure_time: Optional[datetime] = None,
+) -> List[RankedRouteScore]:
+    """
+    Score alternative routes together against one zone load and rank
+    them: SAFE before HIGH_RISK, then by route risk score. Ties keep
+    request order. Routes found in the route cache are not rescored.
+    """
+    hour = _local_hour(departure_time)
+    results: List[Optional[RouteScoreResponse]] = [route_cache.get(p, hour) for p in encoded_polylines]
+    pending = [i for i, result in enumerate(results) if result is None]
+
+    if pending:
+        version = zone_index.version
+        routes = {i: polyline_lib.decode(encoded_polylines[i]) for i in pending}
+        scorable = [coords for coords in routes.values() if len(coords) >= 2]
+        snapshot = await _zones_near_routes(scorable, db) if scorable else None
+        raster = get_risk_raster()
+        for i, coords in routes.items():
+            results[i] = _score_coords(coords, snapshot, hour, raster)
+            route_cache.put(encoded_polylines[i], results[i], version, hour)
+
+    ranked = sorted(
+        enumerate(results),
+        key=lambda item: (
+            item[1].recommendation == RouteRecommendation.HIGH_RISK,
+            item[1].route_risk_score,
+            item[0],
+        ),
+    )
+    return [
+        RankedRouteScore(index=index, rank=rank, **result.model_dump())
+        for rank, (index, result) in enumerate(ranked, start=1)
+    ]
+
+
+def _plan_safe_route(
+    graph: RoadGraph,
+    snapshot: ZoneSnapshot,
+    raster: Optional[RiskRaster],
+    ncrb_multiplier: float,
+    origin: PointSchema,
+    destination: PointSchema,
+) -> SafeRouteResponse:
+    source, source_gap = graph.nearest_node(origin.lat, origin.lng)
+    target, target_gap = graph.nearest_node(destination.lat, destination.lng)
+    if max(source_gap, target_gap) > settings.SAFE_ROUTE_MAX_SNAP_M:
+        raise ValueError("Origin or destination is too far from the road network")
+
+    path = graph.shortest_path(source, target, graph.edge_cost(snapshot, ncrb_multiplier))
+    if path is None:
+        raise ValueError("No route between origin and destination")
+
+    coords = list(zip(graph.node_lat[path].tolist(), graph.node_lng[path].tolist()))
+    score = _score_coords(coords, snapshot, raster=raster)
+    return SafeRouteResponse(
+        polyline=polyline_lib.encode(coords),
+        distance_m=round(graph.path_length_m(path), 1),
+        **score.model_dump(),
+    )
+
+
+async def find_safe_route(
+    origin: PointSchema,
+    destination: PointSchema,
+    graph: RoadGraph,
+    db: AsyncSession,
+) -> SafeRouteResponse:
+    """
+    Suggest the lowest-cost route on the local road graph, where edge
+    cost grows with the risk zones the edge touches and the NCRB bias.
+    The route comes back scored like any /route/score polyline.
+
+    Raises ValueError if either end is off the graph or no route exists.
+    """
+    snapshot = await zone_index.get(db)
+    ncrb_multiplier = await _get_ncrb_bias_multiplier(db)
+    # Resolved here: get_risk_raster() reads the zone index and may schedule
+    # a repaint, which only works on the event loop
+    raster = get_risk_raster()
+    # A* and the per-edge risk pass are CPU-bound: keep them off the event loop
+    return await asyncio.to_thread(
+        _plan_safe_route, graph, snapshot, raster, ncrb_multiplier, origin, destination
+    )
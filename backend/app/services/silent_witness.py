@@ -14,6 +14,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.settings import get_settings
 from app.models import Checkin, RiskZone, User
+from app.services.risk_raster import get_risk_raster
 from app.utils import logger, point_to_wkt
 
 settings = get_settings()
@@ -51,20 +52,27 @@ async def _check_risk_zone(
     db: AsyncSession,
 ) -> Optional[str]:
     """Return an alert message if the point is inside any active risk zone."""
-    stmt = select(RiskZone).where(
-        RiskZone.active == True,  # noqa: E712
-        func.ST_DWithin(
-            RiskZone.centroid,
-            func.ST_GeogFromText(f"POINT({lng} {lat})"),
-            200,  # within 200 m of a risk zone centroid
-        ),
-    )
-    result = await db.execute(stmt)
-    zone = result.scalar_one_or_none()
+    # Risk raster: a cell lookup, confirmed against the zones near it, when
+    # the point is inside the city bbox
+    raster = get_risk_raster()
+    risk_score = raster.point(lat, lng) if raster is not None else None
+
+    if risk_score is None:
+        stmt = select(RiskZone).where(
+            RiskZone.active == True,  # noqa: E712
+            func.ST_DWithin(
+                RiskZone.centroid,
+                func.ST_GeogFromText(f"POINT({lng} {lat})"),
+                200,  # within 200 m of a risk zone centroid
+            ),
+        )
+        result = await db.execute(stmt)
+        zone = result.scalar_one_or_none()
+        risk_score = zone.risk_score if zone else 0
 
-    if zone:
+    if risk_score:
         return (
-            f"⚠️ You are near a high-risk zone (score {zone.risk_score}). "
+            f"⚠️ You are near a high-risk zone (score {risk_score}). "
             "Please stay alert and consider changing your route."
         )
     return None
@@ -3,19 +3,26 @@ Failsafe – Geo-Filtered SOS Emergency Dispatch Service.
 
 Flow:
   1. Store SOS event in DB.
-  2. Find eligible guardians within 5 km (ON_DUTY, ONLINE, fresh location ≤ 60s).
-  3. Insert guardian_alerts for each eligible guardian.
+  2. Run the first dispatch wave: eligible guardians (ON_DUTY, ONLINE, fresh
+     location ≤ 60s), nearest first, from the in-memory guardian index when
+     it is warm or a PostGIS KNN (<->) query otherwise.
+  3. Insert guardian_alerts for each guardian in the wave.
   4. Push targeted WebSocket alert to each guardian's dashboard.
-  5. Send individual Telegram message to each guardian.
-  6. Trigger escalation background task (30s → expand to 10 km + notify admin).
+  5. Queue a Telegram notification for officials/admins.
+  6. Schedule the remaining SOS_DISPATCH_WAVES on the durable escalation
+     scheduler. Each later wave alerts the next ring of guardians not yet
+     alerted and notifies admins; accepting the SOS stops the waves.
+
+Default waves: the nearest 3 within 10 km at once, then everyone within
+2 km after 20s, 5 km after 40s and 10 km after 70s.
 """
 
 import asyncio
 import uuid
 from datetime import datetime, timedelta, timezone
-from typing import List, Tuple
+from typing import Collection, List, NamedTuple, Optional, Tuple
 
-from sqlalchemy import delete, select, text
+from sqlalchemy import delete, insert, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import (
@@ -30,9 +37,31 @@ from app.models import (
     UserRole,
     UserStatus,
 )
+from app.config.settings import get_settings
+from app.services.guardian_index import guardian_index
 from app.services.telegram_bot import notify_admins, send_message
 from app.services.websocket_manager import ws_manager
-from app.utils import logger, point_to_wkt
+from app.utils import logger, point_to_wkt, wkb_to_latlon
+
+settings = get_settings()
+
+
+class DispatchWave(NamedTuple):
+    """One dispatch wave: after delay_s, alert up to max_guardians more within radius_m."""
+
+    delay_s: int
+    radius_m: int
+    max_guardians: Optional[int]
+
+
+def dispatch_waves() -> List[DispatchWave]:
+    """Waves parsed from SOS_DISPATCH_WAVES ("delay_s:radius_m[:max_guardians],…")."""
+    waves = []
+    for wave in settings.SOS_DISPATCH_WAVES.split(","):
+        if wave.strip():
+            parts = [int(part) for part in wave.split(":")]
+            waves.append(DispatchWave(parts[0], parts[1], parts[2] if len(parts) > 2 else None))
+    return waves
 
 
 # ── Helpers ───────────────────────────────────────────
@@ -42,17 +71,28 @@ async def _find_eligible_guardians(
     lng: float,
     radius_m: float,
     db: AsyncSession,
-) -> List[Tuple[User, float]]:
+    limit: Optional[int] = None,
+    exclude: Collection[uuid.UUID] = (),
+) -> List[Tuple[uuid.UUID, float]]:
     """
-    Return (User, distance_m) tuples for guardians that are:
+    Return (guardian_id, distance_m) tuples, nearest first, for the ``limit``
+    nearest guardians not in ``exclude`` that are:
       - Role: GUARDIAN
       - Status: ACTIVE
       - availability_status: ON_DUTY
       - online_status: ONLINE
-      - guardian_locations.updated_at within last 60 seconds
-      - Within radius_m metres of (lat, lng) using PostGIS ST_DWithin on GEOGRAPHY
+      - guardian_locations.updated_at within GUARDIAN_LOCATION_MAX_AGE_S
+      - Within radius_m metres of (lat, lng)
+
+    Answered from the guardian index when it is warm; otherwise with a
+    PostGIS KNN query on GEOGRAPHY (<-> over the guardian_locations GiST
+    index, bounded by ST_DWithin), and the index is warmed meanwhile.
     """
-    freshness_cutoff = datetime.now(timezone.utc) - timedelta(seconds=60)
+    if guardian_index.ready:
+        return guardian_index.nearby(lat, lng, radius_m, limit=limit, exclude=exclude)
+    guardian_index.schedule_warm()
+
+    freshness_cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.GUARDIAN_LOCATION_MAX_AGE_S)
 
     stmt = text("""
         SELECT
@@ -74,29 +114,28 @@ async def _find_eligible_guardians(
                 ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)::geography,
                 :radius_m
             )
-        ORDER BY distance_m
+        ORDER BY gl.location <-> ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)::geography
+        LIMIT :limit
     """)
 
+    # Excluded guardians can only take up len(exclude) of the nearest rows
     result = await db.execute(
         stmt,
-        {"lat": lat, "lng": lng, "radius_m": radius_m, "cutoff": freshness_cutoff},
+        {
+            "lat": lat,
+            "lng": lng,
+            "radius_m": radius_m,
+            "cutoff": freshness_cutoff,
+            "limit": None if limit is None else limit + len(exclude),
+        },
     )
-    rows = result.fetchall()
-    if not rows:
-        return []
-
-    guardian_ids = [row[0] for row in rows]
-    dist_map = {row[0]: row[1] for row in rows}
-
-    users_result = await db.execute(select(User).where(User.id.in_(guardian_ids)))
-    users = {u.id: u for u in users_result.scalars().all()}
-
-    return [(users[gid], dist_map[gid]) for gid in guardian_ids if gid in users]
+    found = [(row[0], row[1]) for row in result.fetchall() if row[0] not in exclude]
+    return found if limit is None else found[:limit]
 
 
 
 async def _dispatch_to_guardians(
-    guardians: List[Tuple[User, float]],
+    guardians: List[Tuple[uuid.UUID, float]],
     sos: SOSEvent,
     citizen: User,
     db: AsyncSession,
@@ -104,98 +143,118 @@ async def _dispatch_to_guardians(
     lng: float,
 ) -> List[uuid.UUID]:
     """
-    For each eligible guardian:
-      - Insert guardian_alert row (status=NEW)
-      - Push WebSocket alert to that guardian's dashboard
+    For all eligible guardians at once:
+      - Insert their guardian_alert rows (status=NEW) in one INSERT … RETURNING
+      - Push the WebSocket alerts to their dashboards concurrently, each
+        bounded by SOS_WS_SEND_TIMEOUT_S
     Guardians do NOT receive Telegram — alerts go to the dashboard only.
     Telegram is reserved for officials/admins only.
     Returns list of guardian IDs alerted.
     """
-    alerted: List[uuid.UUID] = []
+    if not guardians:
+        return []
 
-    for guardian, distance_m in guardians:
-        # Insert alert record
-        alert = GuardianAlert(
-            guardian_id=guardian.id,
-            sos_id=sos.id,
-            status=GuardianAlertStatus.NEW,
-        )
-        db.add(alert)
-        await db.flush()
+    # Insert alert records
+    result = await db.execute(
+        insert(GuardianAlert)
+        .values([
+            {"id": uuid.uuid4(), "guardian_id": guardian_id, "sos_id": sos.id, "status": GuardianAlertStatus.NEW}
+            for guardian_id, _ in guardians
+        ])
+        .returning(GuardianAlert.guardian_id, GuardianAlert.id)
+    )
+    alert_ids = dict(result.all())
 
-        dist_km = round(distance_m / 1000, 2)
+    triggered_at = sos.triggered_at.isoformat() if sos.triggered_at else datetime.now(timezone.utc).isoformat()
 
+    async def push(guardian_id: uuid.UUID, distance_m: float) -> None:
         # WebSocket push to guardian dashboard (targeted, not broadcast)
         payload = {
             "type": "sos_alert",
-            "alert_id": str(alert.id),
+            "alert_id": str(alert_ids[guardian_id]),
             "sos_id": str(sos.id),
             "citizen_id": str(citizen.id),
             "citizen_name": citizen.name,
             "lat": lat,
             "lng": lng,
-            "distance_km": dist_km,
+            "distance_km": round(distance_m / 1000, 2),
             "maps_url": f"https://maps.google.com/?q={lat},{lng}",
-            "triggered_at": sos.triggered_at.isoformat() if sos.triggered_at else datetime.now(timezone.utc).isoformat(),
+            "triggered_at": triggered_at,
         }
-        delivered = await ws_manager.send_guardian(str(guardian.id), payload)
-        logger.info(f"SOS WS → guardian {guardian.id}: {'delivered' if delivered else 'not connected (will see on next poll)'}")
-
-        alerted.append(guardian.id)
+        delivered = await ws_manager.send_guardian(str(guardian_id), payload, timeout=settings.SOS_WS_SEND_TIMEOUT_S)
+        logger.info(f"SOS WS → guardian {guardian_id}: {'delivered' if delivered else 'not connected (will see on next poll)'}")
 
-    return alerted
+    await asyncio.gather(*(push(guardian_id, distance_m) for guardian_id, distance_m in guardians))
 
+    return [guardian_id for guardian_id, _ in guardians]
 
-# ── Escalation ────────────────────────────────────────
 
-async def _escalation_task(
-    sos_id: uuid.UUID,
+async def _dispatch_wave(
+    wave: DispatchWave,
+    sos: SOSEvent,
+    citizen: User,
+    db: AsyncSession,
     lat: float,
     lng: float,
-    db_factory,
+    already_alerted: Collection[uuid.UUID] = (),
+) -> List[uuid.UUID]:
+    """Alert the next wave: the nearest guardians within its radius not alerted yet."""
+    guardians = await _find_eligible_guardians(
+        lat, lng, wave.radius_m, db, limit=wave.max_guardians, exclude=already_alerted
+    )
+    return await _dispatch_to_guardians(guardians, sos, citizen, db, lat, lng)
+
+
+# ── Escalation ────────────────────────────────────────
+
+async def escalate_sos(
+    sos: SOSEvent,
+    stage: int,
+    wave: DispatchWave,
+    db: AsyncSession,
 ) -> None:
     """
-    Background task: wait 30s; if the SOS is still ACTIVE (not ASSIGNED),
-    expand search to 10 km and notify the authority dashboard.
+    One later dispatch wave for a still-ACTIVE SOS (run by the escalation
+    scheduler): alert the wave's guardians who were not alerted yet and
+    notify the authority dashboard. The caller commits.
     """
-    await asyncio.sleep(30)
+    lat, lng = wkb_to_latlon(sos.location)
+    radius_m = wave.radius_m
+    waited_s = int((datetime.now(timezone.utc) - sos.triggered_at).total_seconds()) if sos.triggered_at else 0
+    logger.warning(f"SOS {sos.id}: No guardian accepted in {waited_s}s → escalating to {radius_m / 1000:g} km")
 
-    async with db_factory() as db:
-        sos = await db.get(SOSEvent, sos_id)
-        if sos is None or sos.status != SOSStatus.ACTIVE:
-            return  # Already handled
-
-        logger.warning(f"SOS {sos_id}: No guardian accepted in 30s → escalating to 10 km")
+    already_alerted = set(
+        (await db.execute(select(GuardianAlert.guardian_id).where(GuardianAlert.sos_id == sos.id))).scalars()
+    )
 
-        # Find guardians at 10 km
-        extended_guardians = await _find_eligible_guardians(lat, lng, 10_000, db)
+    citizen_result = await db.execute(select(User).where(User.id == sos.user_id))
+    citizen = citizen_result.scalar_one_or_none()
 
-        citizen_result = await db.execute(select(User).where(User.id == sos.user_id))
-        citizen = citizen_result.scalar_one_or_none()
+    alerted: List[uuid.UUID] = []
+    if citizen is not None:
+        alerted = await _dispatch_wave(wave, sos, citizen, db, lat, lng, already_alerted)
 
-        if extended_guardians:
-            await _dispatch_to_guardians(extended_guardians, sos, citizen, db, lat, lng)
-            await db.commit()
+    # Notify admin dashboard
+    await ws_manager.broadcast_admin({
+        "type": "sos_escalated",
+        "sos_id": str(sos.id),
+        "citizen_id": str(sos.user_id),
+        "citizen_name": citizen.name if citizen else "Unknown",
+        "lat": lat,
+        "lng": lng,
+        "stage": stage + 1,
+        "new_radius_m": radius_m,
+        "guardians_notified": len(alerted),
+        "escalated_at": datetime.now(timezone.utc).isoformat(),
+    })
 
-        # Notify admin dashboard
-        await ws_manager.broadcast_admin({
-            "type": "sos_escalated",
-            "sos_id": str(sos_id),
-            "citizen_id": str(sos.user_id),
-            "citizen_name": citizen.name if citizen else "Unknown",
-            "lat": lat,
-            "lng": lng,
-            "new_radius_m": 10_000,
-            "escalated_at": datetime.now(timezone.utc).isoformat(),
-        })
-
-        await notify_admins(
-            f"⚠️ *SOS ESCALATED*\n"
-            f"No guardian accepted within 30s.\n"
-            f"SOS ID: `{sos_id}`\n"
-            f"Location: https://maps.google.com/?q={lat},{lng}\n"
-            f"Expanded search to 10 km."
-        )
+    await notify_admins(
+        f"⚠️ *SOS ESCALATED*\n"
+        f"No guardian accepted within {waited_s}s.\n"
+        f"SOS ID: `{sos.id}`\n"
+        f"Location: https://maps.google.com/?q={lat},{lng}\n"
+        f"Expanded search to {radius_m / 1000:g} km ({len(alerted)} more guardian(s) alerted)."
+    )
 
 
 # ── Public API ────────────────────────────────────────
@@ -209,27 +268,36 @@ async def trigger_sos(
     """
     Full geo-filtered SOS dispatch:
       1. Store SOS event.
-      2. Find eligible guardians within 5 km.
-      3. Alert each guardian individually (WS + Telegram).
+      2. Run the first dispatch wave, if it is immediate.
+      3. Alert each guardian in it individually (WS).
       4. Notify admin dashboard.
-      5. Schedule 30-second escalation.
+      5. Schedule the next wave.
     """
+    from app.services.sos_escalation import escalation_scheduler
+
+    waves = dispatch_waves()
+    immediate = bool(waves) and waves[0].delay_s <= 0
+    stage = 1 if immediate else 0
     event = SOSEvent(
         user_id=user.id,
         location=point_to_wkt(lat, lng),
         status=SOSStatus.ACTIVE,
+        # Later waves run on the durable escalation scheduler
+        escalation_stage=stage,
+        escalate_at=(
+            datetime.now(timezone.utc) + timedelta(seconds=waves[stage].delay_s) if stage < len(waves) else None
+        ),
     )
     db.add(event)
     await db.flush()
 
     logger.warning(f"SOS triggered by user {user.id} at ({lat}, {lng}) → event {event.id}")
 
-    # Find eligible guardians within 5 km
-    guardians = await _find_eligible_guardians(lat, lng, 5_000, db)
-    logger.info(f"SOS {event.id}: {len(guardians)} eligible guardians within 5 km")
-
-    # Dispatch
-    await _dispatch_to_guardians(guardians, event, user, db, lat, lng)
+    # First wave right away (nearest guardians first)
+    guardians: List[uuid.UUID] = []
+    if immediate:
+        guardians = await _dispatch_wave(waves[0], event, user, db, lat, lng)
+        logger.info(f"SOS {event.id}: {len(guardians)} guardian(s) alerted within {waves[0].radius_m / 1000:g} km")
 
     # Always alert admin dashboard
     await ws_manager.broadcast_admin({
@@ -244,6 +312,7 @@ async def trigger_sos(
     })
 
     # Telegram alert to officials/admins — includes live location
+    # (queued on the Telegram outbox; does not delay the response)
     await notify_admins(
         f"🚨 *SOS ALERT — OFFICIAL NOTIFICATION*\n"
         f"👤 Citizen: *{user.name}*\n"
@@ -253,10 +322,8 @@ async def trigger_sos(
         f"Monitor the dashboard for real-time updates."
     )
 
-    # Schedule escalation (non-blocking)
-    from app.database.session import _get_session_factory
-    db_factory = _get_session_factory()
-    asyncio.create_task(_escalation_task(event.id, lat, lng, db_factory))
+    # Escalation is durable: the scheduler picks up escalate_at once committed
+    escalation_scheduler.notify(event.escalate_at)
 
     return event
 
@@ -299,8 +366,9 @@ async def accept_sos_alert(
     # Mark this alert accepted
     alert.status = GuardianAlertStatus.ACCEPTED
 
-    # Assign the SOS
+    # Assign the SOS (and stop escalating it)
     sos.status = SOSStatus.ASSIGNED
+    sos.escalate_at = None
 
     # Remove all other pending alerts for this SOS
     await db.execute(
@@ -365,6 +433,7 @@ async def resolve_sos(
 
     event.status = SOSStatus.RESOLVED
     event.resolved_at = datetime.now(timezone.utc)
+    event.escalate_at = None
     await db.flush()
 
     logger.info(f"SOS {sos_id} resolved")
@@ -0,0 +1,169 @@
+"""
+Failsafe – Durable SOS escalation scheduler.
+
+Escalation timers live in the database, not in sleeping tasks: every
+ACTIVE SOS carries the next SOS_DISPATCH_WAVES wave and when it is due
+(sos_events.escalation_stage / escalate_at). One scheduler loop per
+process serves all of them:
+
+  - It sleeps until the earliest due time it knows of, or at most
+    SOS_ESCALATION_POLL_S (to pick up events other workers scheduled).
+    trigger_sos wakes it early when a new event is due sooner.
+  - Due events are claimed up to SOS_ESCALATION_BATCH at a time with
+    FOR UPDATE SKIP LOCKED, and leased by pushing escalate_at forward
+    SOS_ESCALATION_LEASE_S, so a crash mid-stage only retries it.
+  - Each stage locks its SOS row (FOR UPDATE), runs the next dispatch
+    wave (sos.escalate_sos), then moves the event on to the next wave or
+    clears its timer. An accept waits for the lock, so a stage never
+    alerts guardians or re-arms the timer of an SOS that was just
+    accepted; a stage another worker already ran (after the lease ran
+    out) is skipped.
+  - On startup the first pass runs immediately, so escalations that fell
+    due while the app was down are resumed.
+
+Accepting or resolving an SOS clears its timer.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import func, select, update
+
+from app.config.settings import get_settings
+from app.database.session import _get_session_factory
+from app.models import SOSEvent, SOSStatus
+from app.services.sos import DispatchWave, dispatch_waves, escalate_sos
+from app.utils import logger
+
+settings = get_settings()
+
+
+class EscalationScheduler:
+    """Single loop that runs due SOS escalation stages in batches."""
+
+    def __init__(self):
+        self._loop_task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+        self._next_due: Optional[datetime] = None
+
+    # ── Lifecycle ─────────────────────────────────────
+    def start(self) -> None:
+        if self._loop_task is not None:
+            return
+        self._loop_task = asyncio.create_task(self._loop(), name="sos-escalation")
+        logger.info(f"Failsafe: Escalation scheduler started (waves {settings.SOS_DISPATCH_WAVES})")
+
+    async def stop(self) -> None:
+        task, self._loop_task = self._loop_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    # ── Scheduling ────────────────────────────────────
+    def notify(self, due: Optional[datetime]) -> None:
+        """Wake the loop early if ``due`` is sooner than anything it is waiting for."""
+        if due is None:
+            return
+        if self._next_due is None or due < self._next_due:
+            self._next_due = due
+            self._wake.set()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                self._next_due = await self.run_due()
+            except Exception as exc:
+                logger.error(f"Failsafe: Escalation pass failed: {exc}")
+                self._next_due = None
+
+            # Sleep until the next known due time (or the poll interval);
+            # notify() cuts the sleep short for a sooner timer
+            while True:
+                timeout = settings.SOS_ESCALATION_POLL_S
+                if self._next_due is not None:
+                    until_due = (self._next_due - datetime.now(timezone.utc)).total_seconds()
+                    # (at least 1 s, so a due event locked by another worker is not spun on)
+                    timeout = min(timeout, max(until_due, 1.0))
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout)
+                except asyncio.TimeoutError:
+                    break
+
+    # ── Processing ────────────────────────────────────
+    async def run_due(self) -> Optional[datetime]:
+        """Run every due stage, batch by batch; return the next pending due time."""
+        waves = dispatch_waves()
+        factory = _get_session_factory()
+        while True:
+            now = datetime.now(timezone.utc)
+            async with factory() as db:
+                # Handled events keep no timer
+                await db.execute(
+                    update(SOSEvent)
+                    .where(SOSEvent.escalate_at <= now, SOSEvent.status != SOSStatus.ACTIVE)
+                    .values(escalate_at=None)
+                )
+                claimed = (await db.execute(
+                    select(SOSEvent.id, SOSEvent.escalation_stage)
+                    .where(SOSEvent.escalate_at <= now, SOSEvent.status == SOSStatus.ACTIVE)
+                    .order_by(SOSEvent.escalate_at)
+                    .limit(settings.SOS_ESCALATION_BATCH)
+                    .with_for_update(skip_locked=True)
+                )).all()
+                if claimed:
+                    await db.execute(
+                        update(SOSEvent)
+                        .where(SOSEvent.id.in_([sos_id for sos_id, _ in claimed]))
+                        .values(escalate_at=now + timedelta(seconds=settings.SOS_ESCALATION_LEASE_S))
+                    )
+                await db.commit()
+
+            if claimed:
+                logger.info(f"Failsafe: Escalating {len(claimed)} SOS event(s)")
+                semaphore = asyncio.Semaphore(settings.SOS_ESCALATION_CONCURRENCY)
+
+                async def run(sos_id, stage: int) -> None:
+                    async with semaphore:
+                        await self._run_stage(sos_id, stage, waves)
+
+                await asyncio.gather(*(run(sos_id, stage) for sos_id, stage in claimed))
+            if len(claimed) < settings.SOS_ESCALATION_BATCH:
+                break
+
+        async with factory() as db:
+            return (await db.execute(
+                select(func.min(SOSEvent.escalate_at)).where(SOSEvent.status == SOSStatus.ACTIVE)
+            )).scalar_one_or_none()
+
+    async def _run_stage(self, sos_id, stage: int, waves: List[DispatchWave]) -> None:
+        """Run one claimed wave and move the event on to its next wave."""
+        try:
+            async with _get_session_factory()() as db:
+                sos = (await db.execute(
+                    select(SOSEvent).where(SOSEvent.id == sos_id).with_for_update()
+                )).scalar_one_or_none()
+                # Gone, or this stage already ran on another worker
+                if sos is None or sos.escalation_stage != stage:
+                    return
+                if sos.status == SOSStatus.ACTIVE and stage < len(waves):
+                    await escalate_sos(sos, stage, waves[stage], db)
+                    stage += 1
+                sos.escalation_stage = stage
+                sos.escalate_at = (
+                    datetime.now(timezone.utc) + timedelta(seconds=waves[stage].delay_s)
+                    if sos.status == SOSStatus.ACTIVE and stage < len(waves)
+                    else None
+                )
+                await db.commit()
+        except Exception as exc:
+            # The lease runs out and the stage is retried
+            logger.error(f"Failsafe: Escalation of SOS {sos_id} (stage {stage + 1}) failed: {exc}")
+
+
+# Singleton
+escalation_scheduler = EscalationScheduler()
@@ -4,54 +4,203 @@ Telegram Bot Integration.
 Provides:
   - send_message / notify_admins  (outgoing)
   - webhook handler              (incoming: location → report)
+
+Admin notifications never block the caller: notify_admins puts the
+message on a bounded in-process outbox (TELEGRAM_QUEUE_SIZE; when full
+the oldest queued message is dropped) that TELEGRAM_WORKERS workers
+drain. All sends share one pooled httpx.AsyncClient. Failed sends are
+retried up to TELEGRAM_MAX_RETRIES times with exponential backoff, and
+a 429 waits for Telegram's retry_after.
 """
 
-from typing import Optional
+import asyncio
+import random
+from typing import List, Optional, Tuple
 
 import httpx
 
 from app.utils import logger
 
+# First retry waits about this long; each further retry doubles it
+_BACKOFF_BASE_S = 1.0
 
-def _get_bot_config():
+
+def _get_settings():
     """Lazy config access to avoid import-time settings validation."""
     from app.config.settings import get_settings
-    settings = get_settings()
+    return get_settings()
+
+
+def _get_bot_config():
+    """Lazy config access to avoid import-time settings validation."""
+    settings = _get_settings()
     return settings.TELEGRAM_BOT_TOKEN, settings.TELEGRAM_ADMIN_CHAT_ID
 
 
-async def send_message(chat_id: str, text: str, parse_mode: str = "Markdown") -> bool:
-    """Send a Telegram message to a specific chat."""
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """The shared, connection-pooling client for Bot API calls."""
+    global _client
+    if _client is None or _client.is_closed:
+        settings = _get_settings()
+        _client = httpx.AsyncClient(
+            timeout=settings.TELEGRAM_TIMEOUT_S,
+            limits=httpx.Limits(max_connections=max(1, settings.TELEGRAM_WORKERS) + 2),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _send_once(token: str, chat_id: str, text: str, parse_mode: str) -> Tuple[bool, Optional[float]]:
+    """
+    One sendMessage attempt. Returns (delivered, retry_after_s):
+    retry_after_s is None when retrying cannot help, 0 for a plain
+    backoff, or the wait Telegram asked for on a 429.
+    """
+    url = f"{_get_settings().TELEGRAM_API_BASE}/bot{token}/sendMessage"
+    try:
+        resp = await _get_client().post(
+            url,
+            json={
+                "chat_id": chat_id,
+                "text": text,
+                "parse_mode": parse_mode,
+            },
+        )
+    except httpx.HTTPError as exc:
+        logger.error(f"Telegram send failed: {exc}")
+        return False, 0.0
+
+    if resp.status_code == 429:
+        try:
+            retry_after = float(resp.json().get("parameters", {}).get("retry_after", 0))
+        except ValueError:
+            retry_after = 0.0
+        logger.warning(f"Telegram: rate limited, retry after {retry_after:g}s")
+        return False, retry_after
+    if resp.is_error:
+        logger.error(f"Telegram send failed: HTTP {resp.status_code} {resp.text[:200]}")
+        return False, 0.0 if resp.status_code >= 500 else None
+    return True, None
+
+
+async def send_message(chat_id: str, text: str, parse_mode: str = "Markdown", retries: int = 0) -> bool:
+    """Send a Telegram message to a specific chat, retrying up to ``retries`` times."""
     token, _ = _get_bot_config()
     if not token:
         logger.warning("Telegram: bot token not configured, skipping send")
         return False
 
-    base_url = f"https://api.telegram.org/bot{token}"
-    try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            resp = await client.post(
-                f"{base_url}/sendMessage",
-                json={
-                    "chat_id": chat_id,
-                    "text": text,
-                    "parse_mode": parse_mode,
-                },
-            )
-            resp.raise_for_status()
+    for attempt in range(retries + 1):
+        delivered, retry_after = await _send_once(token, chat_id, text, parse_mode)
+        if delivered:
             return True
-    except httpx.HTTPError as exc:
-        logger.error(f"Telegram send failed: {exc}")
-        return False
+        if retry_after is None or attempt == retries:
+            return False
+        backoff = _BACKOFF_BASE_S * 2 ** attempt * (0.5 + random.random())
+        await asyncio.sleep(max(retry_after, backoff) if retry_after else backoff)
+    return False
+
+
+class TelegramOutbox:
+    """Bounded queue of outgoing messages, drained by a pool of workers."""
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        settings = _get_settings()
+        self._queue = asyncio.Queue(maxsize=max(1, settings.TELEGRAM_QUEUE_SIZE))
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"telegram-outbox-{i}")
+            for i in range(max(1, settings.TELEGRAM_WORKERS))
+        ]
+
+    async def stop(self, drain_timeout_s: float = 5.0) -> None:
+        """Give queued messages ``drain_timeout_s`` to go out, then stop the workers."""
+        if self._queue is not None and self._workers:
+            try:
+                await asyncio.wait_for(self._queue.join(), drain_timeout_s)
+            except asyncio.TimeoutError:
+                logger.warning(f"Telegram: {self._queue.qsize()} queued message(s) not sent at shutdown")
+        for task in self._workers:
+            task.cancel()
+        for task in self._workers:
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._workers = []
+        self._queue = None
+        await close_client()
+
+    def enqueue(self, chat_id: str, text: str, parse_mode: str = "Markdown") -> None:
+        """Queue a message; when the queue is full the oldest one is dropped."""
+        self.start()
+        if self._queue.full():
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self.dropped += 1
+            logger.warning(f"Telegram: outbox full, dropped the oldest message ({self.dropped} dropped)")
+        self._queue.put_nowait((chat_id, text, parse_mode))
+
+    async def _worker(self) -> None:
+        retries = _get_settings().TELEGRAM_MAX_RETRIES
+        while True:
+            chat_id, text, parse_mode = await self._queue.get()
+            try:
+                if await send_message(chat_id, text, parse_mode, retries=retries):
+                    self.sent += 1
+                else:
+                    self.failed += 1
+            except Exception as exc:
+                self.failed += 1
+                logger.error(f"Telegram: outbox send failed: {exc}")
+            finally:
+                self._queue.task_done()
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "workers": len(self._workers),
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+        }
+
+
+# Singleton
+telegram_outbox = TelegramOutbox()
 
 
 async def notify_admins(text: str) -> bool:
-    """Convenience wrapper: send a message to the admin chat."""
-    _, admin_chat_id = _get_bot_config()
+    """
+    Convenience wrapper: queue a message to the admin chat. Returns as
+    soon as it is queued (False if Telegram is not configured).
+    """
+    token, admin_chat_id = _get_bot_config()
     if not admin_chat_id:
         logger.warning("Telegram: admin chat ID not configured, skipping notify")
         return False
-    return await send_message(admin_chat_id, text)
+    if not token:
+        logger.warning("Telegram: bot token not configured, skipping notify")
+        return False
+    telegram_outbox.enqueue(admin_chat_id, text)
+    return True
 
 
 async def handle_webhook(payload: dict, db) -> Optional[str]:
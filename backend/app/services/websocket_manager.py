@@ -8,8 +8,9 @@ Channels:
   /ws/citizen            – citizen feed
 """
 
+import asyncio
 import json
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from fastapi import WebSocket
 
@@ -85,16 +86,18 @@ class WebSocketManager:
         self._guardian_connections.pop(guardian_id, None)
         logger.info(f"WS: Guardian {guardian_id} disconnected ({len(self._guardian_connections)} online)")
 
-    async def send_guardian(self, guardian_id: str, data: dict) -> bool:
+    async def send_guardian(self, guardian_id: str, data: dict, timeout: Optional[float] = None) -> bool:
         """Send a targeted JSON message to a specific guardian by ID.
 
         Returns True if delivered, False if the guardian isn't connected.
+        A send that fails or takes longer than ``timeout`` seconds drops
+        the connection (the client reconnects and polls its alerts).
         """
         ws = self._guardian_connections.get(guardian_id)
         if ws is None:
             return False
         try:
-            await ws.send_text(json.dumps(data))
+            await asyncio.wait_for(ws.send_text(json.dumps(data)), timeout)
             return True
         except Exception:
             self._guardian_connections.pop(guardian_id, None)
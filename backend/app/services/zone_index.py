@@ -0,0 +1,228 @@
+"""
+Path Finder – In-memory risk zone index.
+
+Keeps every active RiskZone (centroid, optional polygon, score, level)
+in a shapely STRtree so routes can be tested against zones without a
+PostGIS round trip.
+
+  - Snapshots are immutable and carry the index version they were built
+    for; a rebuild swaps in a new snapshot with a single assignment.
+  - invalidate() bumps the version whenever zones change (clustering,
+    decay sweep, authority accepts). A snapshot older than the current
+    version – or than ZONE_INDEX_MAX_AGE_S – is cold and not used.
+  - While the index is cold, callers fall back to their DB query and a
+    single background rebuild is scheduled on its own session.
+
+A zone touches a route when its centroid is within RISK_CLUSTER_RADIUS_M
+of the polyline or its polygon intersects the polyline.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+import shapely
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import get_settings
+from app.database.session import _get_session_factory
+from app.models import RiskZone
+from app.utils import EARTH_RADIUS_M, logger, point_segment_distance_m
+
+settings = get_settings()
+
+# Zones without an hourly profile score the same at every hour
+_FLAT_PROFILE = [100] * 24
+
+
+@dataclass(frozen=True)
+class ZoneSnapshot:
+    """Immutable view of the active zones at one index version."""
+
+    version: int
+    built_at: float
+    ids: List
+    lat: np.ndarray
+    lng: np.ndarray
+    risk_score: np.ndarray
+    risk_level: np.ndarray
+    polygons: np.ndarray  # shapely Polygon or None per zone
+    tree: shapely.STRtree
+    hourly_profile: np.ndarray  # (n, 24) percent of risk_score per local hour
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def scores_at(self, hour: Optional[int]) -> np.ndarray:
+        """Zone risk scores for a local hour of day (None = all-day scores)."""
+        if hour is None:
+            return self.risk_score
+        return np.minimum(self.risk_score * self.hourly_profile[:, hour] // 100, 100)
+
+    def query_route(
+        self,
+        lats: np.ndarray,
+        lngs: np.ndarray,
+        radius_m: float,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return (segment, zone) index pairs for every route segment a zone
+        touches. Segment i runs from point i to point i + 1.
+        """
+        if len(lats) < 2:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        return self.query_segments(lats[:-1], lngs[:-1], lats[1:], lngs[1:], radius_m)
+
+    def query_segments(
+        self,
+        a_lat: np.ndarray,
+        a_lng: np.ndarray,
+        b_lat: np.ndarray,
+        b_lng: np.ndarray,
+        radius_m: float,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return (segment, zone) index pairs for independent segments
+        a[i] → b[i] (e.g. road graph edges).
+        """
+        empty = np.empty(0, dtype=np.int64)
+        if len(self) == 0 or len(a_lat) == 0:
+            return empty, empty
+
+        # Candidates: zones whose footprint box meets the segment box padded by
+        # radius_m (lng padding taken at the highest latitude)
+        pad_lat = np.degrees(radius_m / EARTH_RADIUS_M)
+        max_lat = max(np.abs(a_lat).max(), np.abs(b_lat).max())
+        pad_lng = pad_lat / max(np.cos(np.radians(max_lat + pad_lat)), 1e-6)
+        boxes = shapely.box(
+            np.minimum(a_lng, b_lng) - pad_lng,
+            np.minimum(a_lat, b_lat) - pad_lat,
+            np.maximum(a_lng, b_lng) + pad_lng,
+            np.maximum(a_lat, b_lat) + pad_lat,
+        )
+        seg, zone = self.tree.query(boxes)
+        if len(seg) == 0:
+            return empty, empty
+
+        # Exact centroid test: point–segment distance
+        hit = point_segment_distance_m(
+            self.lat[zone], self.lng[zone], a_lat[seg], a_lng[seg], b_lat[seg], b_lng[seg]
+        ) <= radius_m
+
+        # Polygon zones also touch any segment crossing their polygon
+        has_polygon = ~hit & (self.polygons[zone] != None)  # noqa: E711
+        if has_polygon.any():
+            idx = np.flatnonzero(has_polygon)
+            segments = shapely.linestrings(
+                np.stack([
+                    np.column_stack([a_lng[seg[idx]], a_lat[seg[idx]]]),
+                    np.column_stack([b_lng[seg[idx]], b_lat[seg[idx]]]),
+                ], axis=1)
+            )
+            hit[idx] = shapely.intersects(self.polygons[zone[idx]], segments)
+
+        return seg[hit].astype(np.int64), zone[hit].astype(np.int64)
+
+
+class ZoneIndex:
+    """Process-local, versioned index of active risk zones."""
+
+    def __init__(self):
+        self._version = 0
+        self._snapshot: Optional[ZoneSnapshot] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def invalidate(self) -> None:
+        """Mark the current snapshot stale after zones changed."""
+        self._version += 1
+
+    def current(self) -> Optional[ZoneSnapshot]:
+        """The snapshot if it is fresh; otherwise schedule a rebuild and return None."""
+        snapshot = self._snapshot
+        if (
+            snapshot is not None
+            and snapshot.version == self._version
+            and time.monotonic() - snapshot.built_at < settings.ZONE_INDEX_MAX_AGE_S
+        ):
+            return snapshot
+        self.schedule_refresh()
+        return None
+
+    async def get(self, db: AsyncSession) -> ZoneSnapshot:
+        """The fresh snapshot, rebuilding it on ``db`` first if it is cold."""
+        snapshot = self.current()
+        if snapshot is None:
+            snapshot = await self.rebuild(db)
+        return snapshot
+
+    def schedule_refresh(self) -> None:
+        """Rebuild in the background unless a rebuild is already running."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh(), name="zone-index-refresh")
+
+    async def _refresh(self) -> None:
+        try:
+            async with _get_session_factory()() as db:
+                await self.rebuild(db)
+        except Exception as exc:
+            logger.error(f"PathFinder: Zone index rebuild failed: {exc}")
+
+    async def rebuild(self, db: AsyncSession) -> ZoneSnapshot:
+        """Load active zones and swap in a new snapshot."""
+        version = self._version
+        stmt = select(*zone_columns()).where(RiskZone.active == True)  # noqa: E712
+        snapshot = build_snapshot((await db.execute(stmt)).all(), version)
+        self._snapshot = snapshot
+        logger.info(f"PathFinder: Zone index v{version} built ({len(snapshot)} active zones)")
+        return snapshot
+
+
+def zone_columns() -> tuple:
+    """Columns build_snapshot expects, for select()."""
+    return (
+        RiskZone.id,
+        RiskZone.risk_score,
+        RiskZone.risk_level,
+        func.ST_Y(func.ST_GeomFromWKB(RiskZone.centroid)).label("lat"),
+        func.ST_X(func.ST_GeomFromWKB(RiskZone.centroid)).label("lng"),
+        func.ST_AsBinary(func.ST_GeomFromWKB(RiskZone.polygon)).label("polygon"),
+        RiskZone.hourly_profile,
+    )
+
+
+def build_snapshot(rows, version: int) -> ZoneSnapshot:
+    """Build a snapshot from rows selected with zone_columns()."""
+    lat = np.array([r.lat for r in rows], dtype=np.float64)
+    lng = np.array([r.lng for r in rows], dtype=np.float64)
+    polygons = np.array(
+        [shapely.from_wkb(bytes(r.polygon)) if r.polygon is not None else None for r in rows],
+        dtype=object,
+    )
+    footprints = np.where(polygons != None, polygons, shapely.points(lng, lat))  # noqa: E711
+
+    return ZoneSnapshot(
+        version=version,
+        built_at=time.monotonic(),
+        ids=[r.id for r in rows],
+        lat=lat,
+        lng=lng,
+        risk_score=np.array([r.risk_score for r in rows], dtype=np.int64),
+        risk_level=np.array([r.risk_level for r in rows], dtype=object),
+        polygons=polygons,
+        tree=shapely.STRtree(footprints),
+        hourly_profile=np.array(
+            [r.hourly_profile or _FLAT_PROFILE for r in rows], dtype=np.int64
+        ).reshape(len(rows), 24),
+    )
+
+
+# Singleton
+zone_index = ZoneIndex()
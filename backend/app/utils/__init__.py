@@ -1,4 +1,23 @@
-from app.utils.geo import point_to_wkt, wkb_to_latlon
+from app.utils.geo import (
+    EARTH_RADIUS_M,
+    haversine_m,
+    point_segment_distance_m,
+    point_to_wkt,
+    project_local_m,
+    segment_disc_span,
+    simplify_polyline,
+    wkb_to_latlon,
+)
 from app.utils.logging import logger
 
-__all__ = ["point_to_wkt", "wkb_to_latlon", "logger"]
+__all__ = [
+    "EARTH_RADIUS_M",
+    "haversine_m",
+    "point_segment_distance_m",
+    "point_to_wkt",
+    "project_local_m",
+    "segment_disc_span",
+    "simplify_polyline",
+    "wkb_to_latlon",
+    "logger",
+]
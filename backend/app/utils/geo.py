@@ -2,8 +2,11 @@
 Shared utility helpers used across services and routes.
 """
 
+import numpy as np
 from geoalchemy2.elements import WKTElement
 
+EARTH_RADIUS_M = 6_371_000
+
 
 def point_to_wkt(lat: float, lng: float) -> WKTElement:
     """Convert lat/lng to a PostGIS GEOGRAPHY(Point) WKT element."""
@@ -21,3 +24,138 @@ def wkb_to_latlon(wkb_element) -> tuple[float, float]:
         return (point.y, point.x)
     except Exception:
         return (0.0, 0.0)
+
+
+def project_local_m(
+    lat: np.ndarray,
+    lng: np.ndarray,
+    lat0: float | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Equirectangular projection of lat/lng arrays to metres (x east, y north).
+
+    Scaled at reference latitude ``lat0`` (defaults to the mean), so
+    distances are accurate to well under 1 % across a single city.
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lng = np.asarray(lng, dtype=np.float64)
+    if lat0 is None:
+        lat0 = float(lat.mean()) if len(lat) else 0.0
+    x = np.radians(lng) * EARTH_RADIUS_M * np.cos(np.radians(lat0))
+    y = np.radians(lat) * EARTH_RADIUS_M
+    return x, y
+
+
+def haversine_m(
+    lat1: np.ndarray,
+    lng1: np.ndarray,
+    lat2: np.ndarray,
+    lng2: np.ndarray,
+) -> np.ndarray:
+    """Element-wise great-circle distance in metres between lat/lng arrays."""
+    lat1, lng1, lat2, lng2 = (np.radians(np.asarray(a, dtype=np.float64)) for a in (lat1, lng1, lat2, lng2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def point_segment_distance_m(
+    lat: np.ndarray,
+    lng: np.ndarray,
+    a_lat: np.ndarray,
+    a_lng: np.ndarray,
+    b_lat: np.ndarray,
+    b_lng: np.ndarray,
+) -> np.ndarray:
+    """
+    Element-wise distance in metres from points to segments a → b.
+
+    The closest point on each segment is found in a local projection at
+    the segment's mid-latitude; the distance to it is haversine.
+    """
+    lat, lng, a_lat, a_lng, b_lat, b_lng = (
+        np.asarray(v, dtype=np.float64) for v in (lat, lng, a_lat, a_lng, b_lat, b_lng)
+    )
+    k = np.cos(np.radians((a_lat + b_lat) / 2))
+    dx, dy = (b_lng - a_lng) * k, b_lat - a_lat
+    px, py = (lng - a_lng) * k, lat - a_lat
+    length2 = dx * dx + dy * dy
+    dot = px * dx + py * dy
+    t = np.divide(dot, length2, out=np.zeros(np.broadcast(dot, length2).shape), where=length2 > 0)
+    t = np.clip(t, 0.0, 1.0)
+    return haversine_m(lat, lng, a_lat + t * (b_lat - a_lat), a_lng + t * (b_lng - a_lng))
+
+
+def segment_disc_span(
+    lat: np.ndarray,
+    lng: np.ndarray,
+    radius_m: float,
+    a_lat: np.ndarray,
+    a_lng: np.ndarray,
+    b_lat: np.ndarray,
+    b_lng: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Element-wise part of each segment a → b inside the disc of radius_m
+    around a point, as (t0, t1) fractions of the segment; t0 > t1 where
+    the segment misses the disc.
+
+    The closest-approach parameter t is found in a local projection at the
+    segment's mid-latitude, and the chord is t ± sqrt(r² − d²) / length.
+    """
+    lat, lng, a_lat, a_lng, b_lat, b_lng = (
+        np.asarray(v, dtype=np.float64) for v in (lat, lng, a_lat, a_lng, b_lat, b_lng)
+    )
+    m_per_deg = np.pi * EARTH_RADIUS_M / 180
+    k = np.cos(np.radians((a_lat + b_lat) / 2))
+    dx, dy = (b_lng - a_lng) * k * m_per_deg, (b_lat - a_lat) * m_per_deg
+    px, py = (lng - a_lng) * k * m_per_deg, (lat - a_lat) * m_per_deg
+    length2 = dx * dx + dy * dy
+    shape = np.broadcast(px, length2).shape
+    t = np.divide(px * dx + py * dy, length2, out=np.zeros(shape), where=length2 > 0)
+    # Squared distance from the point to the segment's line
+    d2 = (px - t * dx) ** 2 + (py - t * dy) ** 2
+    half = np.sqrt(np.maximum(radius_m * radius_m - d2, 0.0))
+    half = np.divide(half, np.sqrt(length2), out=np.zeros(shape), where=length2 > 0)
+    inside = d2 <= radius_m * radius_m
+    t0 = np.where(inside, np.maximum(t - half, 0.0), 1.0)
+    t1 = np.where(inside, np.minimum(t + half, 1.0), 0.0)
+    return t0, t1
+
+
+def simplify_polyline(
+    lat: np.ndarray,
+    lng: np.ndarray,
+    tolerance_m: float,
+) -> np.ndarray:
+    """
+    Douglas-Peucker simplification. Returns the indices of the points to
+    keep (always including both ends); every dropped point is within
+    ``tolerance_m`` of the simplified line.
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lng = np.asarray(lng, dtype=np.float64)
+    n = len(lat)
+    if n < 3 or tolerance_m <= 0:
+        return np.arange(n)
+
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, n - 1]] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        inner = slice(first + 1, last)
+        dist = point_segment_distance_m(
+            lat[inner], lng[inner], lat[first], lng[first], lat[last], lng[last]
+        )
+        worst = int(np.argmax(dist))
+        if dist[worst] > tolerance_m:
+            split = first + 1 + worst
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return np.flatnonzero(keep)
@@ -0,0 +1,159 @@
+"""
+Benchmark: Oracle clustering in Python (sklearn / grid) vs in PostGIS.
+
+For each engine reports wall time and the approximate number of bytes
+the database sends back (binary DataRow payload: the report rows for the
+Python engines, one row per cluster for the "postgis" engine), then
+compares the "postgis" clusters with the "dbscan" ones: the largest
+distance from a PostGIS centroid to the nearest sklearn centroid and the
+largest score difference between the two. The engines differ slightly
+by design (ST_ClusterDBSCAN runs on Web Mercator with a mean-latitude
+eps), so small offsets are expected, but a missing cluster or an offset
+near RISK_CLUSTER_RADIUS_M means the SQL is wrong.
+
+Usage:
+    python bench_oracle_postgis.py [--seed N]
+
+Runs against DATABASE_URL from .env. With --seed N, N synthetic reports
+are inserted first inside the benchmark transaction, which is rolled
+back at the end – nothing is written permanently.
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+
+import numpy as np
+from scipy.spatial import cKDTree
+from sqlalchemy import text
+
+from app.config.settings import get_settings
+from app.database.session import _get_session_factory
+from app.services import risk_engine
+from app.utils import project_local_m
+
+SEED_SQL = text("""
+    INSERT INTO reports (id, user_id, location, category, created_at, is_verified)
+    SELECT
+        gen_random_uuid(),
+        :user_id,
+        ST_SetSRID(ST_MakePoint(
+            73.40 + (random() - 0.5) * 0.15,
+            18.75 + (random() - 0.5) * 0.15
+        ), 4326)::geography,
+        (ARRAY['DARKNESS', 'LOITERING', 'HARASSMENT', 'OTHER'])[1 + floor(random() * 4)::int]::reportcategory,
+        now() - random() * interval '7 days',
+        FALSE
+    FROM generate_series(1, :n)
+""")
+
+
+def _value_bytes(value) -> int:
+    """Approximate binary wire size of one column value."""
+    if value is None:
+        return 0
+    if isinstance(value, (float, int, datetime)):
+        return 8
+    if isinstance(value, UUID):
+        return 16
+    if isinstance(value, Decimal):
+        digits = len(value.as_tuple().digits)
+        return 8 + 2 * ((digits + 3) // 4)
+    return len(str(getattr(value, "value", value)).encode())
+
+
+def _wire_bytes(rows) -> int:
+    """DataRow message size: 1 type + 4 length + 2 count + 4 per column + data."""
+    return sum(7 + sum(4 + _value_bytes(v) for v in row) for row in rows)
+
+
+async def _python_engine(db, engine: str) -> tuple[int, np.ndarray, np.ndarray, np.ndarray]:
+    settings = get_settings()
+    reports = await risk_engine._fetch_recent_reports(db)
+    labels = risk_engine._cluster_labels(
+        reports.lat, reports.lng, settings.RISK_CLUSTER_RADIUS_M, settings.RISK_CLUSTER_MIN_REPORTS, engine
+    )
+    wanted = np.unique(labels[labels >= 0])
+    lats, lngs, scores, _, _ = risk_engine._summarise_clusters(
+        reports.lat,
+        reports.lng,
+        reports.category,
+        reports.created,
+        labels,
+        wanted,
+        datetime.now(timezone.utc).timestamp(),
+    )
+    # id uuid, lat / lng float8, category int4, created int8
+    return len(reports) * (7 + 5 * 4 + 16 + 8 + 8 + 4 + 8), lats, lngs, scores
+
+
+async def _postgis_engine(db) -> tuple[int, np.ndarray, np.ndarray, np.ndarray]:
+    now = datetime.now(timezone.utc)
+    settings = get_settings()
+    result = await db.execute(
+        risk_engine._CLUSTER_IN_DB_SQL,
+        {
+            "cutoff": now - risk_engine.timedelta(days=settings.RISK_LOOKBACK_DAYS),
+            "now": now,
+            "radius_m": float(settings.RISK_CLUSTER_RADIUS_M),
+            "min_samples": settings.RISK_CLUSTER_MIN_REPORTS,
+            "categories": [c.value for c in risk_engine.CATEGORY_WEIGHTS],
+            "weights": list(risk_engine.CATEGORY_WEIGHTS.values()),
+            "tz": settings.RISK_TIMEZONE,
+        },
+    )
+    rows = result.all()
+    lats = np.array([r.lat for r in rows], dtype=np.float64)
+    lngs = np.array([r.lng for r in rows], dtype=np.float64)
+    # Same normalisation as risk_engine._cluster_in_database
+    scores = np.array([min(int(float(r.raw_score) * 5), 100) for r in rows], dtype=np.int64)
+    return _wire_bytes(rows), lats, lngs, scores
+
+
+def _compare(reference: tuple, other: tuple) -> str:
+    """Largest centroid offset and score difference of ``other`` vs ``reference``."""
+    ref_lat, ref_lng, ref_score = reference
+    lat, lng, score = other
+    if not len(ref_lat) or not len(lat):
+        return f"{len(lat)} vs {len(ref_lat)} clusters, nothing to match"
+    lat0 = float(np.concatenate([ref_lat, lat]).mean())
+    tree = cKDTree(np.column_stack(project_local_m(ref_lat, ref_lng, lat0)))
+    offset, nearest = tree.query(np.column_stack(project_local_m(lat, lng, lat0)))
+    return (
+        f"{len(lat)} vs {len(ref_lat)} clusters, centroid offset max {offset.max():.1f} m, "
+        f"score diff max {int(np.abs(score - ref_score[nearest]).max())}"
+    )
+
+
+async def main(seed: int) -> None:
+    factory = _get_session_factory()
+    async with factory() as db:
+        if seed:
+            user_id = (await db.execute(text("SELECT id FROM users LIMIT 1"))).scalar_one()
+            await db.execute(SEED_SQL, {"user_id": user_id, "n": seed})
+            print(f"Seeded {seed:,} synthetic reports (rolled back afterwards)")
+
+        print(f"{'engine':<8} {'time ms':>9} {'bytes':>14} {'clusters':>9}")
+        clusters = {}
+        for name in ("dbscan", "grid", "postgis"):
+            start = time.perf_counter()
+            if name == "postgis":
+                size, *clusters[name] = await _postgis_engine(db)
+            else:
+                size, *clusters[name] = await _python_engine(db, name)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"{name:<8} {elapsed:>9.0f} {size:>14,} {len(clusters[name][0]):>9}")
+
+        for name in ("grid", "postgis"):
+            print(f"{name} vs dbscan: {_compare(clusters['dbscan'], clusters[name])}")
+
+        await db.rollback()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seed", type=int, default=0, help="insert N synthetic reports first")
+    asyncio.run(main(parser.parse_args().seed))
@@ -0,0 +1,97 @@
+"""
+Convert an OpenStreetMap extract into the road graph used by /route/safe.
+
+Reads an .osm XML file (e.g. a city extract from a local Overpass or
+osmium export), keeps the ways walkers can use and writes the compact
+CSR arrays PathFinder loads (see app/services/road_graph.py).
+
+Usage:
+    python build_road_graph.py city.osm road_graph.npz [--oneway]
+
+By default every road is walkable in both directions; --oneway honours
+oneway tags (for vehicle routing). Point ROAD_GRAPH_PATH at the output.
+Runs fully offline.
+"""
+
+import argparse
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from app.utils.geo import haversine_m
+
+# highway=* values a pedestrian can use
+WALKABLE = {
+    "primary", "primary_link", "secondary", "secondary_link", "tertiary", "tertiary_link",
+    "unclassified", "residential", "living_street", "service", "pedestrian", "footway",
+    "path", "steps", "track", "trunk", "trunk_link", "road", "cycleway",
+}
+
+
+def _read_osm(path: str, oneway: bool):
+    """Return node coordinates by OSM id and directed (from, to) OSM id pairs."""
+    coords = {}
+    edges = []
+    for _, elem in ET.iterparse(path, events=("end",)):
+        if elem.tag == "node":
+            coords[int(elem.get("id"))] = (float(elem.get("lat")), float(elem.get("lon")))
+            elem.clear()
+        elif elem.tag == "way":
+            tags = {t.get("k"): t.get("v") for t in elem.iter("tag")}
+            if tags.get("highway") in WALKABLE and tags.get("foot") != "no":
+                refs = [int(nd.get("ref")) for nd in elem.iter("nd")]
+                direction = tags.get("oneway") if oneway else None
+                for a, b in zip(refs, refs[1:]):
+                    if direction in ("yes", "true", "1"):
+                        edges.append((a, b))
+                    elif direction == "-1":
+                        edges.append((b, a))
+                    else:
+                        edges.append((a, b))
+                        edges.append((b, a))
+            elem.clear()
+    return coords, edges
+
+
+def build(coords: dict, edges: list) -> dict:
+    """CSR arrays for the nodes referenced by ``edges`` (duplicates dropped)."""
+    edges = [(a, b) for a, b in edges if a != b and a in coords and b in coords]
+    osm_ids = np.unique(np.array(edges, dtype=np.int64).ravel())
+    node_lat = np.array([coords[i][0] for i in osm_ids.tolist()])
+    node_lng = np.array([coords[i][1] for i in osm_ids.tolist()])
+
+    pairs = np.searchsorted(osm_ids, np.array(edges, dtype=np.int64))
+    pairs = np.unique(pairs, axis=0)  # sorted by source, then target
+    source, target = pairs[:, 0], pairs[:, 1]
+
+    indptr = np.zeros(len(osm_ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(source, minlength=len(osm_ids)), out=indptr[1:])
+    return {
+        "node_lat": node_lat,
+        "node_lng": node_lng,
+        "indptr": indptr,
+        "indices": target.astype(np.int32),
+        "length_m": haversine_m(
+            node_lat[source], node_lng[source], node_lat[target], node_lng[target]
+        ).astype(np.float32),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("osm", help="input .osm XML file")
+    parser.add_argument("output", help="output .npz file")
+    parser.add_argument("--oneway", action="store_true", help="honour oneway tags")
+    args = parser.parse_args()
+
+    coords, edges = _read_osm(args.osm, args.oneway)
+    graph = build(coords, edges)
+    np.savez_compressed(args.output, **graph)
+    print(
+        f"Wrote {args.output}: {len(graph['node_lat']):,} nodes, "
+        f"{len(graph['indices']):,} edges"
+    )
+
+
+if __name__ == "__main__":
+    main()
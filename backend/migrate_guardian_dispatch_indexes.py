@@ -0,0 +1,28 @@
+import asyncio
+import os
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import text
+from dotenv import load_dotenv
+
+load_dotenv()
+url = os.getenv("DATABASE_URL")
+if not url:
+    print("NO DB URL")
+    exit(1)
+
+engine = create_async_engine(url)
+
+async def run_migration():
+    with open(os.path.join(os.path.dirname(__file__), "migrations", "006_guardian_dispatch_indexes.sql")) as f:
+        sql = f.read()
+    statements = [
+        s.strip() for s in sql.split(";")
+        if s.strip() and not all(line.startswith("--") for line in s.strip().splitlines())
+    ]
+    async with engine.begin() as conn:
+        for statement in statements:
+            await conn.execute(text(statement))
+    print("Successfully added guardian dispatch indexes.")
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
@@ -0,0 +1,26 @@
+-- ============================================================
+-- SafePulse – Risk Zone Decay Migration
+-- Adds evidence_score / evidence_at to risk_zones for the Oracle
+-- decay sweep. Run this in the Supabase SQL Editor or via psql.
+-- ============================================================
+
+ALTER TABLE risk_zones ADD COLUMN IF NOT EXISTS evidence_score INTEGER;
+ALTER TABLE risk_zones ADD COLUMN IF NOT EXISTS evidence_at    TIMESTAMPTZ;
+
+-- Existing clustering zones (no authority / source report) start
+-- decaying from their last update
+UPDATE risk_zones
+SET evidence_score = risk_score,
+    evidence_at    = updated_at
+WHERE evidence_at IS NULL
+  AND source_report_id IS NULL
+  AND authority_id IS NULL;
+
+-- The sweep only scans active zones that carry evidence
+CREATE INDEX IF NOT EXISTS idx_risk_zones_evidence_at
+    ON risk_zones (evidence_at)
+    WHERE active AND evidence_at IS NOT NULL;
+
+-- ============================================================
+-- Done! risk_zones can now decay.
+-- ============================================================
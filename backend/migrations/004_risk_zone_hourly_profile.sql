@@ -0,0 +1,14 @@
+-- ============================================================
+-- SafePulse – Risk Zone Hourly Profile Migration
+-- Adds hourly_profile to risk_zones: the Oracle's per-hour risk
+-- multipliers (percent, 24 local hours) used for time-of-day route
+-- scoring. Run this in the Supabase SQL Editor or via psql.
+-- ============================================================
+
+ALTER TABLE risk_zones ADD COLUMN IF NOT EXISTS hourly_profile SMALLINT[];
+
+-- Existing zones keep a flat profile (NULL) until they are next clustered
+
+-- ============================================================
+-- Done! risk_zones can now carry hourly profiles.
+-- ============================================================
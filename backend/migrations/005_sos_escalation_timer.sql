@@ -0,0 +1,27 @@
+-- ============================================================
+-- SafePulse – SOS Escalation Timer Migration
+-- Adds escalation_stage / escalate_at to sos_events so pending
+-- escalations survive restarts and are processed in batches by
+-- the escalation scheduler. Run this in the Supabase SQL Editor
+-- or via psql.
+-- ============================================================
+
+ALTER TABLE sos_events ADD COLUMN IF NOT EXISTS escalation_stage SMALLINT NOT NULL DEFAULT 0;
+ALTER TABLE sos_events ADD COLUMN IF NOT EXISTS escalate_at      TIMESTAMPTZ;
+
+-- Recent events still ACTIVE when this runs lost their in-process
+-- timers: escalate them on the scheduler's first pass
+UPDATE sos_events
+SET escalate_at = now()
+WHERE status = 'ACTIVE'
+  AND escalate_at IS NULL
+  AND triggered_at >= now() - INTERVAL '1 hour';
+
+-- The scheduler only scans events with a pending timer
+CREATE INDEX IF NOT EXISTS idx_sos_events_escalate_at
+    ON sos_events (escalate_at)
+    WHERE escalate_at IS NOT NULL;
+
+-- ============================================================
+-- Done! SOS escalations are now durable.
+-- ============================================================
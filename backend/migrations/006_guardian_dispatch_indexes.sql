@@ -0,0 +1,19 @@
+-- ============================================================
+-- SafePulse – Guardian Dispatch Indexes Migration
+-- Indexes for wave-based SOS dispatch: the KNN (<->) guardian
+-- lookup and the per-SOS "already alerted" check. Run this in the
+-- Supabase SQL Editor or via psql.
+-- ============================================================
+
+-- Nearest-guardian ordering (ORDER BY location <-> point) walks this
+-- GiST index; create_all makes it too, so it may already exist
+CREATE INDEX IF NOT EXISTS idx_guardian_locations_location
+    ON guardian_locations USING GIST (location);
+
+-- Each later wave skips guardians already alerted for the SOS
+CREATE INDEX IF NOT EXISTS idx_guardian_alerts_sos_id
+    ON guardian_alerts (sos_id);
+
+-- ============================================================
+-- Done! Guardian dispatch lookups are indexed.
+-- ============================================================